@@ -58,10 +58,7 @@ from src.utils.data_science_workflow import (
 )
 from src.utils.advanced_visualization import render_advanced_visualization_page
 from src.utils.performance_optimizer import performance_optimizer
-from src.utils.user_experience import (
-    user_guide, feedback_system, help_system, 
-    progress_tracker, notification_system, render_user_experience_components
-)
+from src.utils.user_experience import render_user_experience_components
 # 导入高级格式转换模块
 from src.utils.advanced_format_converter import render_format_conversion_section
 # 导入数据格式转换页面
@@ -49,10 +49,9 @@ class JSONConverter:
             # 确保是列表格式
             if isinstance(data, dict):
                 # 如果顶层是字典，尝试提取值为列表的字段
-                list_candidates = [v for v in data.values() if isinstance(v, list)]
+                list_candidates = [(k, v) for k, v in data.items() if isinstance(v, list)]
                 if len(list_candidates) == 1:
-                    data = list_candidates[0]
-                    extracted_field = [k for k, v in data.items() if v == data][0]
+                    extracted_field, data = list_candidates[0]
                     info_message = f"检测到嵌套结构，已提取字段 `{extracted_field}` 进行转换。"
                 else:
                     info_message = "JSON顶层为对象但未找到可转换的数组字段。尝试直接展开。"
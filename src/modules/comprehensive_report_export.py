@@ -7,10 +7,13 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import logging
 from typing import Dict, Any, List, Optional
 from src.utils.report_exporter import ReportExporter, get_download_link, get_download_link_bytes
 from src.utils.data_processing import get_data_info
 
+logger = logging.getLogger(__name__)
+
 class ComprehensiveReportExporter:
     """综合报告导出器"""
     
@@ -427,7 +430,7 @@ class ComprehensiveReportExporter:
                 chinese_font_name = FontConfig.register_chinese_font()
                 styles = FontConfig.create_chinese_styles(chinese_font_name)
             except Exception as e:
-                print(f"字体注册失败，使用备用方案: {e}")
+                logger.warning("字体注册失败，使用备用方案: %s", e)
                 # 使用备用方案
                 chinese_font_name = 'Helvetica'
                 styles = FontConfig.create_fallback_styles()
@@ -106,8 +106,11 @@ def _handle_file_upload(uploaded_file, session_manager):
         # 显示数据基本信息
         _display_data_info(data, session_manager)
         
+        # 各列缺失值数量只计算一次，数据预览与智能分析建议共用
+        missing_counts = data.isnull().sum()
+        
         # 数据预览
-        _display_data_preview(data)
+        _display_data_preview(data, missing_counts)
         
         st.markdown("---")
         
@@ -119,7 +122,7 @@ def _handle_file_upload(uploaded_file, session_manager):
         
         # 智能分析建议
         ux_enhancements = get_ux_enhancements()
-        ux_enhancements.render_analysis_suggestions(data)
+        ux_enhancements.render_analysis_suggestions(data, missing_counts=missing_counts)
         
         # 数据格式转换提示
         st.info('💡 数据格式转换功能已移至独立的"🔄 数据格式转换"页面，请使用顶部导航访问。')
@@ -164,11 +167,11 @@ def _display_data_info(data, session_manager):
         st.metric("缺失值", data_info['missing_values'])
 
 
-def _display_data_preview(data):
+def _display_data_preview(data, missing_counts=None):
     """显示数据预览"""
     # 使用增强的数据预览
     ux_enhancements = get_ux_enhancements()
-    ux_enhancements.render_data_preview_enhanced(data, max_rows=10)
+    ux_enhancements.render_data_preview_enhanced(data, max_rows=10, missing_counts=missing_counts)
 
 
 def _render_basic_analysis(data):
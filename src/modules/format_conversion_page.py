@@ -234,6 +234,8 @@ def render_format_conversion_page():
                             
                             # 下载转换结果
                             st.subheader("📥 下载转换结果")
+                            if result.get('csv_warning'):
+                                st.warning(result['csv_warning'])
                             
                             col1, col2, col3 = st.columns(3)
                             
@@ -11,8 +11,11 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Dict, Any, List
 import warnings
+import logging
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
 
 class DataAnalysisAI:
     """数据分析AI助手类"""
@@ -841,9 +844,9 @@ def get_ai_assistant() -> Optional[DataAnalysisAI]:
         try:
             ai_assistant = DataAnalysisAI()
         except ValueError as e:
-            print(f"AI助手创建失败 - 配置错误: {e}")
+            logger.warning("AI助手创建失败 - 配置错误: %s", e)
             return None
         except Exception as e:
-            print(f"AI助手创建失败 - 其他错误: {e}")
+            logger.warning("AI助手创建失败 - 其他错误: %s", e)
             return None
     return ai_assistant
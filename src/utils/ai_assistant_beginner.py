@@ -10,8 +10,11 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Dict, Any, List
 import warnings
+import logging
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
 class BeginnerModeAI:
     """新手模式AI助手类"""
     
@@ -322,6 +325,6 @@ def get_beginner_ai_assistant() -> BeginnerModeAI:
         try:
             beginner_ai_assistant = BeginnerModeAI()
         except Exception as e:
-            print(f"AI助手初始化失败：{e}")
+            logger.warning("AI助手初始化失败：%s", e)
             return None
     return beginner_ai_assistant
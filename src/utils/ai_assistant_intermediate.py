@@ -10,8 +10,11 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Dict, Any, List
 import warnings
+import logging
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
 class IntermediateModeAI:
     """普通模式AI助手类"""
     
@@ -303,5 +306,5 @@ def get_intermediate_ai_assistant() -> Optional[IntermediateModeAI]:
     try:
         return IntermediateModeAI()
     except Exception as e:
-        print(f"无法初始化普通模式AI助手：{e}")
+        logger.warning("无法初始化普通模式AI助手：%s", e)
         return None
@@ -11,6 +11,9 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 from io import BytesIO
 import base64
+import logging
+
+logger = logging.getLogger(__name__)
 
 class CloudPDFExporter:
     """云平台PDF导出器"""
@@ -157,18 +160,18 @@ class CloudPDFExporter:
             for font_name in builtin_fonts:
                 try:
                     pdfmetrics.registerFont(UnicodeCIDFont(font_name))
-                    print(f"云平台成功注册字体: {font_name}")
+                    logger.info("云平台成功注册字体: %s", font_name)
                     return font_name
                 except Exception as e:
-                    print(f"字体 {font_name} 注册失败: {e}")
+                    logger.warning("字体 %s 注册失败: %s", font_name, e)
                     continue
             
             # 如果都失败，使用默认字体
-            print("云平台字体注册失败，使用默认字体")
+            logger.warning("云平台字体注册失败，使用默认字体")
             return 'Helvetica'
             
         except Exception as e:
-            print(f"云平台字体注册失败: {e}")
+            logger.warning("云平台字体注册失败: %s", e)
             return 'Helvetica'
     
     def _create_styles_for_cloud(self, font_name: str):
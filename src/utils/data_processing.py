@@ -8,6 +8,7 @@ import numpy as np
 import streamlit as st
 from typing import Optional, List, Dict, Any
 import warnings
+from collections import Counter
 warnings.filterwarnings('ignore')
 
 
@@ -67,8 +68,29 @@ def calculate_correlation_matrix(data: pd.DataFrame) -> pd.DataFrame:
     if numeric_data.empty:
         return pd.DataFrame()
     
-    # 计算相关性矩阵
-    return numeric_data.corr()
+    # 计算相关性矩阵：数据完整时用矩阵乘法一次求出所有列对，含缺失值或无穷值时沿用pandas的成对删除规则
+    try:
+        values = numeric_data.to_numpy(dtype=np.float64, na_value=np.nan)
+    except (TypeError, ValueError):
+        return numeric_data.corr()
+    if len(values) < 2 or not np.isfinite(values).all():
+        return numeric_data.corr()
+    return pd.DataFrame(_pearson_matrix(values), index=numeric_data.columns, columns=numeric_data.columns)
+
+
+def _pearson_matrix(values: np.ndarray) -> np.ndarray:
+    """
+    按列计算无缺失值二维数组的皮尔逊相关系数矩阵
+    各列中心化后做一次矩阵乘法得到协方差，常数列的相关系数为NaN，与pandas一致
+    """
+    centered = values - values.mean(axis=0)
+    cov = centered.T @ centered
+    std = np.sqrt(np.diag(cov))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.outer(std, std)
+    np.clip(corr, -1.0, 1.0, out=corr)
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+    return corr
 
 
 @st.cache_data
@@ -86,7 +108,7 @@ def calculate_data_quality_score(data: pd.DataFrame) -> float:
     total_rows, total_cols = len(data), len(data.columns)
     
     # 缺失值扣分
-    missing_ratio = data.isnull().sum().sum() / (total_rows * total_cols)
+    missing_ratio = data.isna().to_numpy().sum() / (total_rows * total_cols)
     score -= missing_ratio * 30
     
     # 重复值扣分
@@ -130,9 +152,9 @@ def get_data_info(data: pd.DataFrame) -> Dict[str, Any]:
         'rows': len(data),
         'columns': len(data.columns),
         'memory_usage': data.memory_usage(deep=True).sum() / 1024**2,
-        'missing_values': data.isnull().sum().sum(),
+        'missing_values': data.isna().to_numpy().sum(),
         'duplicate_rows': data.duplicated().sum(),
-        'data_types': data.dtypes.value_counts().to_dict(),
+        'data_types': dict(Counter(map(str, data.dtypes)).most_common()),
         'unique_values': [data[col].nunique() for col in data.columns]
     }
 
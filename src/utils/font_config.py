@@ -6,8 +6,12 @@
 
 import platform
 import os
+import functools
+import logging
 from typing import Optional, List
 
+logger = logging.getLogger(__name__)
+
 class FontConfig:
     """字体配置管理类"""
     
@@ -43,8 +47,9 @@ class FontConfig:
             ]
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def find_available_font() -> Optional[str]:
-        """查找可用的中文字体"""
+        """查找可用的中文字体，结果在进程内缓存，每次导出PDF时不再逐个探测字体文件"""
         font_paths = FontConfig.get_system_font_paths()
         
         for font_path in font_paths:
@@ -54,8 +59,12 @@ class FontConfig:
         return None
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def register_chinese_font():
-        """注册中文字体 - 云平台兼容版本"""
+        """
+        注册中文字体 - 云平台兼容版本
+        reportlab的字体注册表在进程内全局有效，注册结果缓存后每次导出PDF不再重新解析字体文件
+        """
         try:
             from reportlab.pdfbase import pdfmetrics
             from reportlab.pdfbase.ttfonts import TTFont
@@ -67,10 +76,10 @@ class FontConfig:
             if font_path:
                 try:
                     pdfmetrics.registerFont(TTFont('ChineseFont', font_path))
-                    print(f"成功注册系统字体: {font_path}")
+                    logger.info("成功注册系统字体: %s", font_path)
                     return 'ChineseFont'
                 except Exception as e:
-                    print(f"TTF字体注册失败: {e}")
+                    logger.warning("TTF字体注册失败: %s", e)
             
             # 尝试注册reportlab内置的中文字体
             builtin_fonts = [
@@ -85,21 +94,21 @@ class FontConfig:
             for font_name in builtin_fonts:
                 try:
                     pdfmetrics.registerFont(UnicodeCIDFont(font_name))
-                    print(f"成功注册内置字体: {font_name}")
+                    logger.info("成功注册内置字体: %s", font_name)
                     return font_name
                 except Exception as e:
-                    print(f"内置字体 {font_name} 注册失败: {e}")
+                    logger.warning("内置字体 %s 注册失败: %s", font_name, e)
                     continue
             
             # 如果都失败，使用默认字体
-            print("所有中文字体注册失败，使用默认字体")
+            logger.warning("所有中文字体注册失败，使用默认字体")
             return 'Helvetica'
             
         except ImportError:
-            print("reportlab库未安装，无法注册字体")
+            logger.warning("reportlab库未安装，无法注册字体")
             return 'Helvetica'
         except Exception as e:
-            print(f"字体注册失败: {e}")
+            logger.warning("字体注册失败: %s", e)
             return 'Helvetica'
     
     @staticmethod
@@ -12,6 +12,7 @@ import io
 import base64
 from datetime import datetime
 import logging
+from collections import Counter
 
 logger = logging.getLogger(__name__)
 
@@ -152,7 +153,7 @@ class FormatConverter:
             "rows": len(data),
             "columns": len(data.columns),
             "memory_usage": data.memory_usage(deep=True).sum() / (1024**2),  # MB
-            "data_types": data.dtypes.value_counts().to_dict(),
+            "data_types": dict(Counter(map(str, data.dtypes)).most_common()),
             "missing_values": data.isnull().sum().to_dict(),
             "complex_columns": []
         }
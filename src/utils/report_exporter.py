@@ -13,6 +13,9 @@ from typing import Dict, Any, List, Optional
 import streamlit as st
 from io import BytesIO
 import base64
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ReportExporter:
     """分析报告导出器"""
@@ -424,7 +427,7 @@ class ReportExporter:
                 chinese_font_name = FontConfig.register_chinese_font()
                 styles = FontConfig.create_chinese_styles(chinese_font_name)
             except Exception as e:
-                print(f"字体注册失败，使用备用方案: {e}")
+                logger.warning("字体注册失败，使用备用方案: %s", e)
                 # 使用备用方案
                 chinese_font_name = 'Helvetica'
                 styles = FontConfig.create_fallback_styles()
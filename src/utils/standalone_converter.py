@@ -5,14 +5,172 @@
 
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import json
 import io
+import functools
+import hashlib
+import copy
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Union
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# 结构分析最多采样的记录数
+_STRUCTURE_SAMPLE_SIZE = 128
+
+# 结构分析结果缓存：内容指纹 -> 分析结果，按LRU淘汰；只保存指纹，不保留上传内容
+_ANALYSIS_CACHE_SIZE = 16
+_ANALYSIS_CACHE: Dict[bytes, Dict[str, Any]] = OrderedDict()
+_ANALYSIS_CACHE_LOCK = threading.Lock()
+
+# 页面头部说明（静态HTML，避免每次重新运行时重复构建）
+_HEADER_HTML = """
+    <div style="
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 25px;
+        border-radius: 15px;
+        color: white;
+        margin-bottom: 25px;
+        box-shadow: 0 8px 32px rgba(30, 64, 175, 0.3);
+    ">
+        <h2 style="color: white; margin-bottom: 20px; text-align: center;">🔄 JSON 转 CSV 转换器</h2>
+        <p style="font-size: 18px; line-height: 1.8; margin-bottom: 20px; text-align: center;">
+            <strong>💡 快速、高效的JSON格式转换工具</strong><br>
+            支持复杂JSON结构的智能转换，自动处理嵌套字段、列表展开等，生成符合Tidy Data原则的整洁CSV格式。
+        </p>
+        <div style="display: flex; gap: 25px; margin-bottom: 20px;">
+            <div style="flex: 1; background: rgba(255,255,255,0.15); padding: 20px; border-radius: 12px; backdrop-filter: blur(10px);">
+                <h4 style="color: #FDE68A; margin-bottom: 15px;">🚀 快速转换</h4>
+                <ul style="margin: 0; padding-left: 20px; font-size: 15px;">
+                    <li>直接上传JSON文件</li>
+                    <li>一键智能转换</li>
+                    <li>即时预览结果</li>
+                    <li>多格式下载</li>
+                </ul>
+            </div>
+            <div style="flex: 1; background: rgba(255,255,255,0.15); padding: 20px; border-radius: 12px; backdrop-filter: blur(10px);">
+                <h4 style="color: #A7F3D0; margin-bottom: 15px;">🧠 智能处理</h4>
+                <ul style="margin: 0; padding-left: 20px; font-size: 15px;">
+                    <li>自动检测数据结构</li>
+                    <li>嵌套字段智能展开</li>
+                    <li>列表字段多行展开</li>
+                    <li>数据完整性保证</li>
+                </ul>
+            </div>
+        </div>
+        <p style="font-size: 16px; margin: 0; text-align: center; opacity: 0.9;">
+            <strong>🎯 适用场景：</strong> API数据处理、复杂JSON转换、数据标准化、Tidy Data生成
+        </p>
+    </div>
+    """
+
+
+def _json_loads(raw: Union[str, bytes]) -> Any:
+    """解析JSON文本，优先使用orjson（可直接解析bytes）"""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _content_fingerprint(raw: bytes) -> bytes:
+    """计算上传内容的指纹（blake2b，16字节摘要）"""
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _analyze_structure(data: Any) -> Dict[str, Any]:
+    """分析已解析的JSON对象结构"""
+    analysis = {
+        'type': type(data).__name__,
+        'size': len(data) if isinstance(data, (list, dict)) else 1,
+        'has_lists': False,
+        'has_nested_objects': False,
+        'sample_keys': [],
+        'complex_columns': []
+    }
+    
+    if isinstance(data, list) and len(data) > 0:
+        # 等间隔采样多条记录，避免首条记录不典型时误判结构
+        step = max(1, len(data) // _STRUCTURE_SAMPLE_SIZE)
+        sample = [item for item in data[::step][:_STRUCTURE_SAMPLE_SIZE] if isinstance(item, dict)]
+        analysis['sample_keys'] = list(dict.fromkeys(key for item in sample for key in item))
+        
+        # 分析嵌套结构（每个字段取首次出现的列表/字典值）
+        complex_keys = set()
+        for item in sample:
+            for key, value in item.items():
+                if key in complex_keys:
+                    continue
+                if isinstance(value, list):
+                    complex_keys.add(key)
+                    analysis['has_lists'] = True
+                    analysis['complex_columns'].append({
+                        'column': key,
+                        'type': 'list',
+                        'sample_length': len(value) if value else 0
+                    })
+                elif isinstance(value, dict):
+                    complex_keys.add(key)
+                    analysis['has_nested_objects'] = True
+                    analysis['complex_columns'].append({
+                        'column': key,
+                        'type': 'dict',
+                        'sample_keys': list(value.keys())[:5]
+                    })
+    
+    return analysis
+
+
+def _to_arrow_backed(df: pd.DataFrame) -> pd.DataFrame:
+    """将object列按PyArrow推断为具体类型（int64/double/string），使CSV写出走类型化格式化"""
+    for col in df.columns[df.dtypes == object]:
+        try:
+            arr = pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            continue  # 混合类型列保持object
+        if not pa.types.is_nested(arr.type):
+            df[col] = pd.arrays.ArrowExtensionArray(arr)
+    return df
+
+
+def _to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    """将DataFrame写为Snappy压缩的Parquet字节；混合类型的列（如填充值与数值混合）按字符串写出"""
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        object_columns = df.columns[df.dtypes == object]
+        table = pa.Table.from_pandas(df.astype({col: str for col in object_columns}), preserve_index=False)
+    buffer = pa.BufferOutputStream()
+    pq.write_table(table, buffer, compression='snappy')
+    return buffer.getvalue().to_pybytes()
+
+
+def _analyze_cached(raw: bytes) -> Dict[str, Any]:
+    """按内容指纹缓存结构分析结果，避免每次重新运行都重复解析；返回副本，调用方可自由修改"""
+    fingerprint = _content_fingerprint(raw)
+    with _ANALYSIS_CACHE_LOCK:
+        cached = _ANALYSIS_CACHE.get(fingerprint)
+        if cached is not None:
+            _ANALYSIS_CACHE.move_to_end(fingerprint)
+            return copy.deepcopy(cached)
+    
+    analysis = _analyze_structure(_json_loads(raw))
+    with _ANALYSIS_CACHE_LOCK:
+        _ANALYSIS_CACHE[fingerprint] = analysis
+        _ANALYSIS_CACHE.move_to_end(fingerprint)
+        if len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_SIZE:
+            _ANALYSIS_CACHE.popitem(last=False)
+    return copy.deepcopy(analysis)
+
+
 class StandaloneJSONConverter:
     """独立的JSON转换器"""
     
@@ -20,7 +178,7 @@ class StandaloneJSONConverter:
         self.supported_formats = ['json', 'txt']
     
     def convert_json_to_csv(self, 
-                           json_data: Union[str, List, Dict], 
+                           json_data: Union[str, bytes, List, Dict], 
                            explode_lists: bool = True,
                            separator: str = ".",
                            fill_na: str = "",
@@ -29,7 +187,7 @@ class StandaloneJSONConverter:
         将JSON数据转换为CSV格式
         
         Args:
-            json_data: JSON数据（字符串、列表或字典）
+            json_data: JSON数据（字符串、字节、列表或字典）
             explode_lists: 是否将列表字段展开为多行
             separator: 嵌套字段分隔符
             fill_na: 缺失值填充
@@ -40,18 +198,17 @@ class StandaloneJSONConverter:
         """
         try:
             # 解析JSON数据
-            if isinstance(json_data, str):
-                data = json.loads(json_data)
+            if isinstance(json_data, (str, bytes)):
+                data = _json_loads(json_data)
             else:
                 data = json_data
             
             # 确保是列表格式
             if isinstance(data, dict):
                 # 如果顶层是字典，尝试提取值为列表的字段
-                list_candidates = [v for v in data.values() if isinstance(v, list)]
+                list_candidates = [(k, v) for k, v in data.items() if isinstance(v, list)]
                 if len(list_candidates) == 1:
-                    data = list_candidates[0]
-                    extracted_field = [k for k, v in data.items() if v == data][0]
+                    extracted_field, data = list_candidates[0]
                     info_message = f"检测到嵌套结构，已提取字段 `{extracted_field}` 进行转换。"
                 else:
                     info_message = "JSON顶层为对象但未找到可转换的数组字段。尝试直接展开。"
@@ -82,10 +239,11 @@ class StandaloneJSONConverter:
             # 填充缺失值
             df = df.fillna(fill_na)
             
-            # 生成CSV数据
-            csv_buffer = io.StringIO()
-            df.to_csv(csv_buffer, index=False, encoding='utf-8')
-            csv_data = csv_buffer.getvalue()
+            # object列转为Arrow类型
+            df = _to_arrow_backed(df)
+            
+            # 生成CSV数据：统一由pandas写出，导出格式不随列类型变化
+            csv_data = df.to_csv(index=False).encode('utf-8')
             
             return {
                 'success': True,
@@ -108,45 +266,14 @@ class StandaloneJSONConverter:
                 'csv_data': None
             }
     
-    def analyze_json_structure(self, json_data: Union[str, List, Dict]) -> Dict[str, Any]:
-        """分析JSON数据结构"""
+    def analyze_json_structure(self, json_data: Union[str, bytes, List, Dict]) -> Dict[str, Any]:
+        """分析JSON数据结构（原始文本按内容指纹缓存）"""
         try:
-            if isinstance(json_data, str):
-                data = json.loads(json_data)
-            else:
-                data = json_data
+            if isinstance(json_data, (str, bytes)):
+                raw = json_data.encode('utf-8') if isinstance(json_data, str) else json_data
+                return _analyze_cached(raw)
             
-            analysis = {
-                'type': type(data).__name__,
-                'size': len(data) if isinstance(data, (list, dict)) else 1,
-                'has_lists': False,
-                'has_nested_objects': False,
-                'sample_keys': [],
-                'complex_columns': []
-            }
-            
-            if isinstance(data, list) and len(data) > 0:
-                sample_item = data[0]
-                analysis['sample_keys'] = list(sample_item.keys()) if isinstance(sample_item, dict) else []
-                
-                # 分析嵌套结构
-                for key, value in sample_item.items() if isinstance(sample_item, dict) else []:
-                    if isinstance(value, list):
-                        analysis['has_lists'] = True
-                        analysis['complex_columns'].append({
-                            'column': key,
-                            'type': 'list',
-                            'sample_length': len(value) if value else 0
-                        })
-                    elif isinstance(value, dict):
-                        analysis['has_nested_objects'] = True
-                        analysis['complex_columns'].append({
-                            'column': key,
-                            'type': 'dict',
-                            'sample_keys': list(value.keys())[:5]
-                        })
-            
-            return analysis
+            return _analyze_structure(json_data)
             
         except Exception as e:
             return {
@@ -157,45 +284,7 @@ class StandaloneJSONConverter:
 def render_standalone_converter():
     """渲染独立的JSON转换工具"""
     
-    st.markdown("""
-    <div style="
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 25px;
-        border-radius: 15px;
-        color: white;
-        margin-bottom: 25px;
-        box-shadow: 0 8px 32px rgba(30, 64, 175, 0.3);
-    ">
-        <h2 style="color: white; margin-bottom: 20px; text-align: center;">🔄 JSON 转 CSV 转换器</h2>
-        <p style="font-size: 18px; line-height: 1.8; margin-bottom: 20px; text-align: center;">
-            <strong>💡 快速、高效的JSON格式转换工具</strong><br>
-            支持复杂JSON结构的智能转换，自动处理嵌套字段、列表展开等，生成符合Tidy Data原则的整洁CSV格式。
-        </p>
-        <div style="display: flex; gap: 25px; margin-bottom: 20px;">
-            <div style="flex: 1; background: rgba(255,255,255,0.15); padding: 20px; border-radius: 12px; backdrop-filter: blur(10px);">
-                <h4 style="color: #FDE68A; margin-bottom: 15px;">🚀 快速转换</h4>
-                <ul style="margin: 0; padding-left: 20px; font-size: 15px;">
-                    <li>直接上传JSON文件</li>
-                    <li>一键智能转换</li>
-                    <li>即时预览结果</li>
-                    <li>多格式下载</li>
-                </ul>
-            </div>
-            <div style="flex: 1; background: rgba(255,255,255,0.15); padding: 20px; border-radius: 12px; backdrop-filter: blur(10px);">
-                <h4 style="color: #A7F3D0; margin-bottom: 15px;">🧠 智能处理</h4>
-                <ul style="margin: 0; padding-left: 20px; font-size: 15px;">
-                    <li>自动检测数据结构</li>
-                    <li>嵌套字段智能展开</li>
-                    <li>列表字段多行展开</li>
-                    <li>数据完整性保证</li>
-                </ul>
-            </div>
-        </div>
-        <p style="font-size: 16px; margin: 0; text-align: center; opacity: 0.9;">
-            <strong>🎯 适用场景：</strong> API数据处理、复杂JSON转换、数据标准化、Tidy Data生成
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # 创建转换器实例
     converter = StandaloneJSONConverter()
@@ -209,8 +298,8 @@ def render_standalone_converter():
     
     if uploaded_file is not None:
         try:
-            # 读取文件内容
-            file_content = uploaded_file.read().decode("utf-8")
+            # 读取文件内容（直接使用上传缓冲区中的字节，无需解码）
+            file_content = uploaded_file.getvalue()
             
             # 分析数据结构
             analysis = converter.analyze_json_structure(file_content)
@@ -317,7 +406,7 @@ def render_standalone_converter():
                             # 下载转换结果
                             st.subheader("📥 下载转换结果")
                             
-                            col1, col2, col3 = st.columns(3)
+                            col1, col2, col3, col4 = st.columns(4)
                             
                             with col1:
                                 # CSV下载
@@ -353,6 +442,16 @@ def render_standalone_converter():
                                     use_container_width=True
                                 )
                             
+                            with col4:
+                                # Parquet下载（点击时才生成）
+                                st.download_button(
+                                    label="📦 下载Parquet文件",
+                                    data=functools.partial(_to_parquet_bytes, result['dataframe']),
+                                    file_name=f"converted_{uploaded_file.name.replace('.json', '.parquet')}",
+                                    mime="application/octet-stream",
+                                    use_container_width=True
+                                )
+                            
                             # 转换建议
                             st.markdown("---")
                             st.subheader("💡 转换建议")
@@ -395,6 +494,7 @@ def render_standalone_converter():
         - CSV：标准逗号分隔值格式
         - Excel：功能丰富的表格格式
         - JSON：重新格式化的JSON数据
+        - Parquet：高压缩比的列式存储格式
         """)
 
 def main():
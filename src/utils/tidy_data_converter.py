@@ -4,24 +4,128 @@
 """
 
 import pandas as pd
+import numpy as np
 import json
 import streamlit as st
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 import io
+import codecs
+import functools
+import sys
 from datetime import datetime
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from fast_json_normalize import fast_json_normalize
+    FAST_JSON_NORMALIZE_AVAILABLE = True
+except ImportError:
+    FAST_JSON_NORMALIZE_AVAILABLE = False
+
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# 结构分析时扫描的最大记录数
+_STRUCTURE_SAMPLE_SIZE = 64
+
+
+def _json_loads(raw: Union[str, bytes]) -> Any:
+    """解析JSON文本，优先使用orjson（可直接解析bytes）"""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _dataframe_to_json(df: pd.DataFrame) -> Union[str, bytes]:
+    """将DataFrame按records格式序列化为缩进JSON，优先使用orjson"""
+    records = df.to_dict('records')
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            records,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(records, ensure_ascii=False, indent=2, default=str)
+
+
+def _dataframe_to_excel(df: pd.DataFrame) -> bytes:
+    """将DataFrame写为XLSX字节，优先使用更快的xlsxwriter引擎"""
+    excel_buffer = io.BytesIO()
+    engine = 'xlsxwriter' if XLSXWRITER_AVAILABLE else 'openpyxl'
+    df.to_excel(excel_buffer, index=False, engine=engine)
+    return excel_buffer.getvalue()
+
+
+def _dataframe_to_csv(df: pd.DataFrame, encoding: str = "utf-8-sig") -> bytes:
+    """将DataFrame写为指定编码的CSV字节"""
+    return df.to_csv(index=False).encode(encoding)
+
+
+def _prepare_csv(df: pd.DataFrame, encoding: str) -> Tuple[Union[functools.partial, bytes], Optional[str]]:
+    """
+    准备CSV下载数据，返回(数据, 编码提示)
+    UTF编码可表示任意字符，延迟到下载时生成；gbk等编码需预先编码，无法表示的字符替换为?并返回提示
+    """
+    if codecs.lookup(encoding).name.startswith('utf'):
+        return functools.partial(_dataframe_to_csv, df, encoding), None
+    
+    text = df.to_csv(index=False)
+    try:
+        return text.encode(encoding), None
+    except UnicodeEncodeError as e:
+        warning = (f"部分字符（如 {e.object[e.start:e.end]!r}）无法用 {encoding} 编码，CSV中已替换为“?”。"
+                   "如需保留全部字符，请选择 utf-8-sig 编码。")
+        return text.encode(encoding, errors='replace'), warning
+
+
+def _categorize(df: pd.DataFrame, max_ratio: float = 0.5) -> pd.DataFrame:
+    """返回副本，其中唯一值占比低于max_ratio的字符串/object列转换为category类型（原DataFrame不变）"""
+    df = df.copy(deep=False)
+    n_rows = max(len(df), 1)
+    for col, dtype in df.dtypes.items():
+        if not pd.api.types.is_string_dtype(dtype):
+            continue
+        try:
+            if df[col].nunique(dropna=False) / n_rows < max_ratio:
+                df[col] = df[col].astype('category')
+        except TypeError:
+            continue  # 含不可哈希值的列保持原类型
+    return df
+
+
+def _dataframe_to_parquet(df: pd.DataFrame) -> bytes:
+    """将DataFrame写为Snappy压缩的Parquet字节；低基数字符串列按category写出，混合类型的列（如填充值与数值混合）按字符串写出"""
+    df = _categorize(df)
+    buffer = io.BytesIO()
+    try:
+        df.to_parquet(buffer, engine='pyarrow', compression='snappy', index=False)
+    except (TypeError, ValueError):
+        # pyarrow的ArrowTypeError/ArrowInvalid分别继承自TypeError/ValueError
+        text_columns = df.select_dtypes(exclude=['number', 'bool']).columns
+        df = df.astype({col: str for col in text_columns})
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, engine='pyarrow', compression='snappy', index=False)
+    return buffer.getvalue()
+
+
 class TidyDataConverter:
     """整洁数据转换器"""
     
     def __init__(self):
         self.supported_input_formats = ['json', 'csv', 'xlsx', 'xls', 'parquet', 'txt']
         self.supported_output_formats = ['csv', 'xlsx', 'parquet', 'json']
+        # 嵌套字段名缓存：(前缀, 键, 分隔符) -> 驻留后的完整字段名
+        self._key_cache = {}
     
     def convert_to_tidy_data(self, 
-                            json_data: Union[str, List, Dict], 
+                            json_data: Union[str, bytes, List, Dict], 
                             separator: str = ".", 
                             fill_na: str = "",
                             max_preview_rows: int = 10,
@@ -30,7 +134,7 @@ class TidyDataConverter:
         将JSON数据转换为真正的整洁数据
         
         Args:
-            json_data: JSON数据（字符串、列表或字典）
+            json_data: JSON数据（字符串、字节、列表或字典）
             separator: 嵌套字段分隔符
             fill_na: 缺失值填充
             max_preview_rows: 预览行数
@@ -39,19 +143,24 @@ class TidyDataConverter:
         Returns:
             包含转换结果和元数据的字典
         """
+        # 原始文本按内容缓存转换结果，仅预览切片随参数变化
+        if isinstance(json_data, (str, bytes)):
+            result = _convert_cached(json_data, separator, fill_na, encoding)
+        else:
+            result = self._convert(json_data, separator, fill_na, encoding)
+        
+        if result['success']:
+            result['preview_data'] = result['dataframe'].head(max_preview_rows)
+        return result
+    
+    def _convert(self, data, separator=".", fill_na="", encoding="utf-8-sig"):
+        """执行整洁数据转换（不含预览切片），返回结果字典"""
         try:
-            # 解析JSON数据
-            if isinstance(json_data, str):
-                data = json.loads(json_data)
-            else:
-                data = json_data
-            
             # 确保是列表格式
             if isinstance(data, dict):
-                list_candidates = [v for v in data.values() if isinstance(v, list)]
+                list_candidates = [(k, v) for k, v in data.items() if isinstance(v, list)]
                 if len(list_candidates) == 1:
-                    data = list_candidates[0]
-                    extracted_field = [k for k, v in data.items() if v == data][0]
+                    extracted_field, data = list_candidates[0]
                     info_message = f"检测到嵌套结构，已提取字段 `{extracted_field}` 进行转换。"
                 else:
                     info_message = "JSON顶层为对象但未找到可转换的数组字段。尝试直接展开。"
@@ -61,42 +170,31 @@ class TidyDataConverter:
             else:
                 info_message = "JSON数据格式正确，开始转换。"
             
-            # 第一步：递归展开所有嵌套列表
-            expanded_data = []
-            for item in data:
-                expanded_items = self._recursive_expand_lists(item)
-                expanded_data.extend(expanded_items)
-            
-            # 第二步：完全扁平化所有嵌套字典
-            flattened_data = []
-            for item in expanded_data:
-                flattened_item = self._flatten_all_dicts(item, separator)
-                flattened_data.append(flattened_item)
-            
-            # 第三步：创建DataFrame
-            df = pd.DataFrame(flattened_data)
+            # 第一步：单次递归展开所有列表并扁平化所有嵌套字典，按列收集
+            columns = self._build_columns(self._iter_tidy_rows(data, separator), fill_na)
             
-            # 第四步：填充缺失值
-            df = df.fillna(fill_na)
+            # 第二步：按列推断类型后一次性创建DataFrame
+            df = pd.DataFrame(
+                {key: self._column_to_array(values) for key, values in columns.items()},
+                copy=False
+            )
             
-            # 第五步：重置索引
-            df = df.reset_index(drop=True)
-            
-            # 生成CSV数据
-            csv_buffer = io.StringIO()
-            df.to_csv(csv_buffer, index=False, encoding=encoding)
-            csv_data = csv_buffer.getvalue()
+            # 第三步：填充原数据中的空值（构造时已是默认RangeIndex，无需重置索引）
+            na_columns = df.columns[df.isna().any()]
+            if len(na_columns) > 0:
+                df[na_columns] = df[na_columns].fillna(fill_na)
             
             # 分析转换效果
             analysis = self._analyze_tidy_data_quality(df)
+            csv_data, csv_warning = _prepare_csv(df, encoding)
             
             return {
                 'success': True,
                 'dataframe': df,
                 'csv_data': csv_data,
+                'csv_warning': csv_warning,
                 'info_message': info_message,
                 'explode_message': f"已完全展开所有列表字段，共生成 {len(df)} 行整洁数据。",
-                'preview_data': df.head(max_preview_rows),
                 'shape': df.shape,
                 'columns': df.columns.tolist(),
                 'dtypes': df.dtypes.to_dict(),
@@ -111,48 +209,98 @@ class TidyDataConverter:
                 'csv_data': None
             }
     
-    def _recursive_expand_lists(self, item):
-        """递归展开所有嵌套列表字段"""
+    def _iter_tidy_rows(self, data, separator="."):
+        """逐条生成整洁数据行；安装了fast-json-normalize时先用其Cython实现扁平化嵌套字典"""
+        if FAST_JSON_NORMALIZE_AVAILABLE and data and all(isinstance(item, dict) for item in data):
+            # order_to_pandas=False按原字段顺序深度优先展开，列顺序与纯Python实现一致
+            for record in fast_json_normalize(data, separator=separator, to_pandas=False, order_to_pandas=False):
+                # 只有仍包含列表的记录才需要继续展开
+                if any(isinstance(value, list) for value in record.values()):
+                    yield from self._expand_and_flatten(record, separator, True)
+                else:
+                    yield record
+        else:
+            for item in data:
+                yield from self._expand_and_flatten(item, separator)
+    
+    def _expand_and_flatten(self, item, separator=".", flattened=False):
+        """单次递归完成列表展开（笛卡尔积）与字典扁平化，逐条生成扁平记录"""
         if not isinstance(item, dict):
-            return [item]
-        
-        # 使用pandas的json_normalize来处理嵌套结构
-        import pandas as pd
+            yield item
+            return
         
-        # 将单个字典转换为DataFrame
-        df = pd.json_normalize(item, sep='.')
+        # 已扁平的记录（由标量元素展开而来）无需再次扁平化
+        flat = item if flattened else self._flatten_all_dicts(item, separator)
         
-        # 找出包含列表的列
-        list_columns = []
-        for col in df.columns:
-            if df[col].apply(lambda x: isinstance(x, list)).any():
-                list_columns.append(col)
+        # 找出第一个列表字段
+        for key, value in flat.items():
+            if isinstance(value, list):
+                break
+        else:
+            yield flat
+            return
         
-        if not list_columns:
-            return [item]
+        for child in value or [None]:
+            record = {}
+            for k, v in flat.items():
+                if k != key:
+                    record[k] = v
+                elif isinstance(child, dict):
+                    for child_key, child_value in child.items():
+                        record[self._join_key(key, child_key, separator)] = child_value
+                else:
+                    record[key] = child
+            # 展开后的记录可能仍包含列表或字典，继续递归
+            yield from self._expand_and_flatten(record, separator, not isinstance(child, dict))
+    
+    def _join_key(self, prefix, key, separator):
+        """拼接嵌套字段名，结果经sys.intern驻留，所有行共享同一字符串对象"""
+        cache_key = (prefix, key, separator)
+        full_key = self._key_cache.get(cache_key)
+        if full_key is None:
+            full_key = self._key_cache[cache_key] = sys.intern(f"{prefix}{separator}{key}")
+        return full_key
+    
+    def _build_columns(self, records, fill_na=""):
+        """按列收集扁平记录（列式存储），记录中缺失的字段以fill_na补齐"""
+        columns = {}
+        n_rows = 0
+        for record in records:
+            if not isinstance(record, dict):
+                record = {'value': record}
+            
+            for key, value in record.items():
+                column = columns.get(key)
+                if column is None:
+                    # 新出现的字段，为之前的行补齐
+                    column = columns[key] = [fill_na] * n_rows
+                column.append(value)
+            n_rows += 1
+            
+            # 为本条记录中缺失的字段补齐
+            if len(record) < len(columns):
+                for column in columns.values():
+                    if len(column) < n_rows:
+                        column.append(fill_na)
         
-        # 展开第一个列表列
-        first_list_col = list_columns[0]
-        expanded_df = df.explode(first_list_col)
+        return columns
+    
+    def _column_to_array(self, values):
+        """根据列中值的类型集合选择最窄的NumPy类型（纯整数→int64，整数/浮点→float64，其余→object）"""
+        value_types = set(map(type, values))
+        try:
+            if value_types == {int}:
+                return np.array(values, dtype=np.int64)
+            if value_types and value_types <= {int, float}:
+                return np.array(values, dtype=np.float64)
+            if value_types == {bool}:
+                return np.array(values, dtype=bool)
+        except OverflowError:
+            pass  # 超出int64范围的整数保持object
         
-        # 如果展开的列包含字典，需要进一步扁平化
-        if expanded_df[first_list_col].apply(lambda x: isinstance(x, dict)).any():
-            # 将展开的DataFrame转换回字典列表
-            expanded_records = []
-            for _, row in expanded_df.iterrows():
-                record = row.to_dict()
-                # 处理展开的字典
-                if isinstance(record[first_list_col], dict):
-                    # 将字典的键值对添加到记录中
-                    for key, value in record[first_list_col].items():
-                        record[f"{first_list_col}.{key}"] = value
-                    # 删除原始的列表列
-                    del record[first_list_col]
-                expanded_records.append(record)
-            return expanded_records
-        else:
-            # 简单列表，直接转换回字典列表
-            return expanded_df.to_dict('records')
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
     
     def _process_nested_lists(self, obj):
         """递归处理嵌套字典中的列表字段"""
@@ -181,28 +329,23 @@ class TidyDataConverter:
         return processed
     
     def _flatten_all_dicts(self, obj, separator="."):
-        """递归扁平化所有字典结构"""
+        """扁平化所有嵌套字典（迭代实现，直接写入结果字典；列表保留原值，由展开步骤处理）"""
         if not isinstance(obj, dict):
             return obj
         
         flattened = {}
-        for key, value in obj.items():
-            if isinstance(value, dict):
-                # 递归扁平化嵌套字典
-                nested = self._flatten_all_dicts(value, separator)
-                for nested_key, nested_value in nested.items():
-                    flattened[f"{key}{separator}{nested_key}"] = nested_value
-            elif isinstance(value, list):
-                # 列表应该已经在之前被展开，这里作为备用处理
-                if len(value) > 0 and isinstance(value[0], dict):
-                    # 如果是字典列表，扁平化第一个字典
-                    first_dict = self._flatten_all_dicts(value[0], separator)
-                    for nested_key, nested_value in first_dict.items():
-                        flattened[f"{key}{separator}{nested_key}"] = nested_value
-                else:
-                    flattened[key] = str(value)
+        # 栈中保存（键前缀，字典项迭代器），深度优先并保持原有字段顺序
+        stack = [(None, iter(obj.items()))]
+        while stack:
+            prefix, items = stack[-1]
+            for key, value in items:
+                full_key = key if prefix is None else self._join_key(prefix, key, separator)
+                if isinstance(value, dict):
+                    stack.append((full_key, iter(value.items())))
+                    break
+                flattened[full_key] = value
             else:
-                flattened[key] = value
+                stack.pop()
         
         return flattened
     
@@ -224,31 +367,35 @@ class TidyDataConverter:
             analysis['has_nested_columns'] = True
             analysis['tidy_score'] -= 20
         
-        # 检查数据类型
-        for col in df.columns:
-            sample_values = df[col].dropna().head(5)
-            if len(sample_values) > 0:
-                first_value = sample_values.iloc[0]
-                data_type = type(first_value).__name__
-                analysis['data_types'][col] = data_type
-                
-                if isinstance(first_value, list):
-                    analysis['has_list_data'] = True
-                    analysis['tidy_score'] -= 30
-                elif isinstance(first_value, dict):
-                    analysis['has_dict_data'] = True
-                    analysis['tidy_score'] -= 30
+        # 记录各列的数据类型
+        analysis['data_types'] = {col: str(dtype) for col, dtype in df.dtypes.items()}
+        
+        # 检查列表/字典数据（一次取出首行，仅首行为空的列再单独查找首个非空值）
+        first_row = df.head(1).to_dict('records')[0] if len(df) > 0 else {}
+        for col, first_value in first_row.items():
+            if not isinstance(first_value, (list, dict)) and pd.isna(first_value):
+                non_null = df[col].dropna()
+                if non_null.empty:
+                    continue
+                first_value = non_null.iloc[0]
+            
+            if isinstance(first_value, list):
+                analysis['has_list_data'] = True
+                analysis['tidy_score'] -= 30
+            elif isinstance(first_value, dict):
+                analysis['has_dict_data'] = True
+                analysis['tidy_score'] -= 30
         
         # 确保分数不为负数
         analysis['tidy_score'] = max(0, analysis['tidy_score'])
         
         return analysis
     
-    def analyze_json_structure(self, json_data: Union[str, List, Dict]) -> Dict[str, Any]:
+    def analyze_json_structure(self, json_data: Union[str, bytes, List, Dict]) -> Dict[str, Any]:
         """分析JSON数据结构"""
         try:
-            if isinstance(json_data, str):
-                data = json.loads(json_data)
+            if isinstance(json_data, (str, bytes)):
+                data = _json_loads(json_data)
             else:
                 data = json_data
             
@@ -263,36 +410,41 @@ class TidyDataConverter:
             }
             
             if isinstance(data, list) and len(data) > 0:
-                sample_item = data[0]
-                analysis['sample_keys'] = list(sample_item.keys()) if isinstance(sample_item, dict) else []
+                # 扫描前若干条记录（而非仅首条）
+                sample = [item for item in data[:_STRUCTURE_SAMPLE_SIZE] if isinstance(item, dict)]
+                analysis['sample_keys'] = list(dict.fromkeys(key for item in sample for key in item))
+                
+                # 分析嵌套结构，同时累计每条记录的展开倍数（各列表长度之积）
+                complex_columns = {}
+                total_row_factor = 0
+                for item in sample:
+                    row_factor = 1
+                    for key, value in item.items():
+                        if isinstance(value, list):
+                            row_factor *= max(1, len(value))
+                            if key not in complex_columns:
+                                analysis['has_lists'] = True
+                                complex_columns[key] = {
+                                    'column': key,
+                                    'type': 'list',
+                                    'sample_length': len(value)
+                                }
+                        elif isinstance(value, dict) and key not in complex_columns:
+                            analysis['has_nested_objects'] = True
+                            complex_columns[key] = {
+                                'column': key,
+                                'type': 'dict',
+                                'sample_keys': list(value.keys())[:5]
+                            }
+                    total_row_factor += row_factor
                 
-                # 分析嵌套结构
-                list_count = 0
-                dict_count = 0
-                for key, value in sample_item.items() if isinstance(sample_item, dict) else []:
-                    if isinstance(value, list):
-                        analysis['has_lists'] = True
-                        list_count += 1
-                        analysis['complex_columns'].append({
-                            'column': key,
-                            'type': 'list',
-                            'sample_length': len(value) if value else 0
-                        })
-                    elif isinstance(value, dict):
-                        analysis['has_nested_objects'] = True
-                        dict_count += 1
-                        analysis['complex_columns'].append({
-                            'column': key,
-                            'type': 'dict',
-                            'sample_keys': list(value.keys())[:5]
-                        })
+                analysis['complex_columns'] = list(complex_columns.values())
                 
-                # 估算整洁数据行数
-                estimated_rows = len(data)
-                for col_info in analysis['complex_columns']:
-                    if col_info['type'] == 'list':
-                        estimated_rows *= max(1, col_info['sample_length'])
-                analysis['estimated_tidy_rows'] = estimated_rows
+                # 估算整洁数据行数：采样记录的平均展开倍数 × 总记录数
+                if sample:
+                    analysis['estimated_tidy_rows'] = round(len(data) * total_row_factor / len(sample))
+                else:
+                    analysis['estimated_tidy_rows'] = len(data)
             
             return analysis
             
@@ -320,6 +472,21 @@ class TidyDataConverter:
         
         return suggestions
 
+@st.cache_data(max_entries=8, show_spinner=False)
+def _convert_cached(json_bytes: Union[str, bytes], separator: str, fill_na: str, encoding: str) -> Dict[str, Any]:
+    """按原始JSON内容与转换参数缓存整洁转换结果"""
+    try:
+        data = _json_loads(json_bytes)
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'dataframe': None,
+            'csv_data': None
+        }
+    return TidyDataConverter()._convert(data, separator, fill_na, encoding)
+
+
 def render_tidy_conversion_section():
     """渲染整洁数据转换部分"""
     
@@ -329,46 +496,21 @@ def render_tidy_conversion_section():
     # 创建转换器实例
     converter = TidyDataConverter()
     
-    # 文件上传区域
-    st.markdown("""
-    <div style="
-        background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-        padding: 20px;
-        border-radius: 12px;
-        color: white;
-        margin-bottom: 20px;
-        box-shadow: 0 4px 16px rgba(16, 185, 129, 0.2);
-    ">
-        <h4 style="color: white; margin-bottom: 15px; text-align: center;">🧹 真正的整洁数据转换器</h4>
-        <p style="font-size: 16px; line-height: 1.6; margin-bottom: 15px; text-align: center;">
-            <strong>💡 完全符合Tidy Data原则的数据转换</strong><br>
-            彻底展开所有列表字段，完全扁平化嵌套结构，生成真正的整洁数据格式。
-        </p>
-        <div style="display: flex; gap: 20px; margin-bottom: 15px;">
-            <div style="flex: 1; background: rgba(255,255,255,0.15); padding: 15px; border-radius: 8px; backdrop-filter: blur(10px);">
-                <h5 style="color: #FDE68A; margin-bottom: 10px;">🧹 完全整洁</h5>
-                <ul style="margin: 0; padding-left: 15px; font-size: 14px;">
-                    <li>展开所有列表字段</li>
-                    <li>扁平化所有嵌套</li>
-                    <li>符合Tidy Data原则</li>
-                    <li>适合数据分析</li>
-                </ul>
-            </div>
-            <div style="flex: 1; background: rgba(255,255,255,0.15); padding: 15px; border-radius: 8px; backdrop-filter: blur(10px);">
-                <h5 style="color: #A7F3D0; margin-bottom: 10px;">📊 数据质量</h5>
-                <ul style="margin: 0; padding-left: 15px; font-size: 14px;">
-                    <li>质量评分系统</li>
-                    <li>转换效果分析</li>
-                    <li>数据完整性保证</li>
-                    <li>多格式输出</li>
-                </ul>
-            </div>
-        </div>
-        <p style="font-size: 14px; margin: 0; text-align: center; opacity: 0.9;">
-            <strong>🎯 适用场景：</strong> 数据分析、机器学习、统计建模、数据可视化
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    # 文件上传区域（原生组件，避免每次重跑都重新解析大段HTML）
+    with st.container(border=True):
+        st.markdown("#### 🧹 真正的整洁数据转换器")
+        st.markdown(
+            "**💡 完全符合Tidy Data原则的数据转换**  \n"
+            "彻底展开所有列表字段，完全扁平化嵌套结构，生成真正的整洁数据格式。"
+        )
+        col_a, col_b = st.columns(2)
+        with col_a:
+            st.markdown("##### 🧹 完全整洁")
+            st.markdown("- 展开所有列表字段\n- 扁平化所有嵌套\n- 符合Tidy Data原则\n- 适合数据分析")
+        with col_b:
+            st.markdown("##### 📊 数据质量")
+            st.markdown("- 质量评分系统\n- 转换效果分析\n- 数据完整性保证\n- 多格式输出")
+        st.caption("🎯 适用场景：数据分析、机器学习、统计建模、数据可视化")
     
     # 文件上传
     uploaded_file = st.file_uploader(
@@ -379,11 +521,12 @@ def render_tidy_conversion_section():
     
     if uploaded_file is not None:
         try:
-            # 读取文件内容
-            file_content = uploaded_file.read().decode("utf-8")
+            # 读取文件内容（转换按原始字节缓存，结构分析使用解析结果）
+            file_bytes = uploaded_file.getvalue()
+            parsed_data = _json_loads(file_bytes)
             
             # 分析数据结构
-            analysis = converter.analyze_json_structure(file_content)
+            analysis = converter.analyze_json_structure(parsed_data)
             
             if 'error' not in analysis:
                 st.success(f"✅ 文件解析成功！数据类型: {analysis['type']}, 大小: {analysis['size']}")
@@ -443,7 +586,7 @@ def render_tidy_conversion_section():
                 if st.button("🧹 执行整洁转换", type="primary", use_container_width=True):
                     with st.spinner("正在转换为整洁数据..."):
                         result = converter.convert_to_tidy_data(
-                            json_data=file_content,
+                            json_data=file_bytes,
                             separator=separator,
                             fill_na=fill_na,
                             max_preview_rows=max_preview,
@@ -496,11 +639,13 @@ def render_tidy_conversion_section():
                             
                             # 下载转换结果
                             st.subheader("📥 下载整洁数据")
+                            if result.get('csv_warning'):
+                                st.warning(result['csv_warning'])
                             
-                            col1, col2, col3 = st.columns(3)
+                            col1, col2, col3, col4 = st.columns(4)
                             
                             with col1:
-                                # CSV下载
+                                # CSV下载（点击时才生成）
                                 st.download_button(
                                     label="📄 下载CSV文件",
                                     data=result['csv_data'],
@@ -510,29 +655,35 @@ def render_tidy_conversion_section():
                                 )
                             
                             with col2:
-                                # Excel下载
-                                excel_buffer = io.BytesIO()
-                                result['dataframe'].to_excel(excel_buffer, index=False, engine='openpyxl')
-                                excel_data = excel_buffer.getvalue()
+                                # Excel下载（点击时才生成工作簿）
                                 st.download_button(
                                     label="📊 下载Excel文件",
-                                    data=excel_data,
+                                    data=functools.partial(_dataframe_to_excel, result['dataframe']),
                                     file_name=f"tidy_data_{uploaded_file.name.replace('.json', '.xlsx')}",
                                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                                     use_container_width=True
                                 )
                             
                             with col3:
-                                # JSON下载
-                                json_data = result['dataframe'].to_json(orient='records', indent=2, force_ascii=False)
+                                # JSON下载（点击时才序列化）
                                 st.download_button(
                                     label="📋 下载JSON文件",
-                                    data=json_data,
+                                    data=functools.partial(_dataframe_to_json, result['dataframe']),
                                     file_name=f"tidy_data_{uploaded_file.name.replace('.json', '_tidy.json')}",
                                     mime="application/json",
                                     use_container_width=True
                                 )
                             
+                            with col4:
+                                # Parquet下载（列式存储，体积小、写入快）
+                                st.download_button(
+                                    label="📦 下载Parquet文件",
+                                    data=functools.partial(_dataframe_to_parquet, result['dataframe']),
+                                    file_name=f"tidy_data_{uploaded_file.name.replace('.json', '.parquet')}",
+                                    mime="application/octet-stream",
+                                    use_container_width=True
+                                )
+                            
                             # 保存转换后的数据到session state
                             st.session_state.tidy_data = result['dataframe']
                             st.success("✅ 整洁数据已保存，可在其他页面使用")
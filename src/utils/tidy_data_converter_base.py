@@ -0,0 +1,160 @@
+"""
+整洁数据转换器基类
+汇总V2/V3/V4共用的结构分析与策略说明
+"""
+
+import pandas as pd
+import json
+from typing import Dict, Any, Optional
+import logging
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+def _dumps(value: Any) -> str:
+    """将复杂对象序列化为紧凑的JSON字符串，优先使用orjson；标准库回退使用相同的紧凑分隔符，输出与是否安装orjson无关"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            # orjson不支持的类型回退到标准库
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _serialize_complex(values: pd.Series, mask: pd.Series) -> pd.Series:
+    """
+    将列中mask标记的字典/数组序列化为JSON字符串
+    其余单元格均为缺失值时，结果存为Arrow连续存储的large_string列以节省内存
+    """
+    if PYARROW_AVAILABLE and (mask.all() or values[~mask].isna().all()):
+        strings = [_dumps(value) if is_complex else None for value, is_complex in zip(values, mask)]
+        return pd.Series(
+            pd.array(strings, dtype=pd.ArrowDtype(pa.large_string())),
+            index=values.index,
+            name=values.name
+        )
+    
+    values = values.copy()
+    values[mask] = values[mask].map(_dumps)
+    return values
+
+
+class TidyDataConverterBase:
+    """整洁数据转换器基类，子类在__init__中注册conversion_strategies并提供各自的策略说明"""
+    
+    # 未指定策略时使用的默认策略
+    DEFAULT_STRATEGY = None
+    # 按结构分析结果推荐的策略：none（无复杂列）、arrays（仅数组）、dicts（仅字典）、mixed（两者都有）
+    RECOMMENDED_STRATEGIES = {}
+    STRATEGY_DESCRIPTIONS = {}
+    STRATEGY_USE_CASES = {}
+    
+    def __init__(self):
+        self.conversion_strategies = {}
+    
+    def convert_to_tidy_data(self, data: pd.DataFrame, strategy: Optional[str] = None, **kwargs) -> pd.DataFrame:
+        """
+        将数据转换为整洁格式
+        
+        Args:
+            data: 原始DataFrame
+            strategy: 转换策略，默认为DEFAULT_STRATEGY
+            **kwargs: 额外参数
+        
+        Returns:
+            pd.DataFrame: 整洁格式的数据
+        """
+        if strategy is None:
+            strategy = self.DEFAULT_STRATEGY
+        
+        # 策略表中保存的是__init__时绑定好的方法，只需一次查表
+        convert = self.conversion_strategies.get(strategy)
+        if convert is None:
+            raise ValueError(f"不支持的转换策略: {strategy}")
+        
+        return convert(data, **kwargs)
+    
+    def _column_kinds(self, df: pd.DataFrame) -> Dict[str, str]:
+        """
+        一次扫描得到每列的类型：含数组为'list'，含字典为'dict'，否则为'scalar'
+        """
+        kinds = {}
+        for col in df.columns:
+            values = df[col]
+            if values.dtype != object:
+                kinds[col] = 'scalar'
+                continue
+            value_types = set(map(type, values))
+            if list in value_types:
+                kinds[col] = 'list'
+            elif dict in value_types:
+                kinds[col] = 'dict'
+            else:
+                kinds[col] = 'scalar'
+        return kinds
+    
+    def analyze_data_structure(self, data: pd.DataFrame) -> Dict[str, Any]:
+        """分析数据结构，推荐最佳转换策略"""
+        analysis = {
+            "total_rows": len(data),
+            "total_columns": len(data.columns),
+            "complex_columns": [],
+            "array_columns": [],
+            "dict_columns": [],
+            "simple_columns": [],
+            "recommended_strategy": self.DEFAULT_STRATEGY
+        }
+        
+        for col in data.columns:
+            values = data[col]
+            valid = values.notna().to_numpy()
+            if not valid.any():
+                continue
+            
+            # 非object列不可能包含字典或数组，无需取样判断
+            if values.dtype != object:
+                analysis["simple_columns"].append(col)
+                continue
+            
+            first_value = values.iat[valid.argmax()]
+            if isinstance(first_value, dict):
+                analysis["dict_columns"].append(col)
+                analysis["complex_columns"].append(col)
+            elif isinstance(first_value, list):
+                analysis["array_columns"].append(col)
+                analysis["complex_columns"].append(col)
+            else:
+                analysis["simple_columns"].append(col)
+        
+        # 推荐策略
+        if len(analysis["complex_columns"]) == 0:
+            structure = "none"
+        elif len(analysis["array_columns"]) > 0 and len(analysis["dict_columns"]) == 0:
+            structure = "arrays"
+        elif len(analysis["dict_columns"]) > 0 and len(analysis["array_columns"]) == 0:
+            structure = "dicts"
+        else:
+            structure = "mixed"
+        analysis["recommended_strategy"] = self.RECOMMENDED_STRATEGIES.get(structure, self.DEFAULT_STRATEGY)
+        
+        return analysis
+    
+    def get_strategy_description(self, strategy: str) -> str:
+        """获取策略描述"""
+        return self.STRATEGY_DESCRIPTIONS.get(strategy, '未知策略')
+    
+    def get_strategy_use_case(self, strategy: str) -> str:
+        """获取策略适用场景"""
+        return self.STRATEGY_USE_CASES.get(strategy, '未知场景')
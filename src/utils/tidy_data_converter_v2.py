@@ -5,16 +5,74 @@
 
 import pandas as pd
 import numpy as np
-import json
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, List
 import logging
 
+from src.utils.tidy_data_converter_base import TidyDataConverterBase, _serialize_complex
+
 logger = logging.getLogger(__name__)
 
-class TidyDataConverterV2:
+def _full_flatten_rows(columns: List[str], rows: List[tuple], scalar_positions: frozenset = frozenset()) -> Dict[str, list]:
+    """
+    完全扁平化一批行，按列返回结果；新列首次出现时按行数预分配（缺失处为NaN）
+    scalar_positions为非object类型列的位置，这些列不可能含字典或数组，在首行时整列取值，之后的行跳过
+    """
+    n_rows = len(rows)
+    flattened = {}
+    all_positions = range(len(columns))
+    complex_positions = [pos for pos in all_positions if pos not in scalar_positions]
+    
+    for i, row in enumerate(rows):
+        for pos in (all_positions if i == 0 else complex_positions):
+            col = columns[pos]
+            if pos in scalar_positions:
+                flattened[col] = [other[pos] for other in rows]
+                continue
+            
+            value = row[pos]
+            if isinstance(value, dict):
+                # 展开字典
+                items = [(f"{col}_{key}", val) for key, val in value.items()]
+            elif isinstance(value, list):
+                # 展开数组
+                items = [(f"{col}_{j}", item) for j, item in enumerate(value)]
+            else:
+                items = [(col, value)]
+            
+            for key, val in items:
+                column = flattened.get(key)
+                if column is None:
+                    column = flattened[key] = [np.nan] * n_rows
+                column[i] = val
+    
+    return flattened
+
+
+class TidyDataConverterV2(TidyDataConverterBase):
     """整洁数据转换器 V2"""
     
+    DEFAULT_STRATEGY = 'minimal'
+    RECOMMENDED_STRATEGIES = {
+        'none': 'minimal',
+        'arrays': 'normalize_arrays',
+        'dicts': 'flatten_dicts',
+        'mixed': 'full_flatten'
+    }
+    STRATEGY_DESCRIPTIONS = {
+        'minimal': '最小化转换：保持原始结构，只将复杂对象转为JSON字符串',
+        'flatten_dicts': '扁平化字典：展开字典为独立列，保持数组为字符串',
+        'normalize_arrays': '标准化数组：将数组展开为多行，创建长格式数据',
+        'full_flatten': '完全扁平化：展开所有复杂结构（字典和数组）'
+    }
+    STRATEGY_USE_CASES = {
+        'minimal': '数据交换、存储、保持原始语义',
+        'flatten_dicts': '数据分析、需要字典字段独立访问',
+        'normalize_arrays': '统计建模、时间序列分析',
+        'full_flatten': '机器学习、完全扁平化需求'
+    }
+    
     def __init__(self):
+        super().__init__()
         self.conversion_strategies = {
             'minimal': self._minimal_strategy,
             'flatten_dicts': self._flatten_dicts_strategy,
@@ -22,41 +80,23 @@ class TidyDataConverterV2:
             'full_flatten': self._full_flatten_strategy
         }
     
-    def convert_to_tidy_data(self, data: pd.DataFrame, strategy: str = 'minimal') -> pd.DataFrame:
-        """
-        将数据转换为整洁格式
-        
-        Args:
-            data: 原始DataFrame
-            strategy: 转换策略
-            
-        Returns:
-            pd.DataFrame: 整洁格式的数据
-        """
-        if strategy not in self.conversion_strategies:
-            raise ValueError(f"不支持的转换策略: {strategy}")
-        
-        return self.conversion_strategies[strategy](data)
-    
     def _minimal_strategy(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         策略1: 最小化转换
         只将复杂对象转换为JSON字符串，保持原始结构
         适用于：数据交换、存储
         """
-        minimal_data = []
+        minimal_df = data.copy()
         
-        for idx, row in data.iterrows():
-            minimal_row = {}
-            for col, value in row.items():
-                if isinstance(value, (dict, list)):
-                    # 将复杂对象转换为JSON字符串
-                    minimal_row[col] = json.dumps(value, ensure_ascii=False)
-                else:
-                    minimal_row[col] = value
-            minimal_data.append(minimal_row)
+        # 只有object列可能包含复杂对象，按列整体序列化
+        for col in minimal_df.columns[minimal_df.dtypes == object]:
+            values = minimal_df[col]
+            mask = values.map(lambda v: isinstance(v, (dict, list)))
+            if mask.any():
+                # 将复杂对象转换为JSON字符串
+                minimal_df[col] = _serialize_complex(values, mask)
         
-        return pd.DataFrame(minimal_data)
+        return minimal_df
     
     def _flatten_dicts_strategy(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -64,23 +104,39 @@ class TidyDataConverterV2:
         展开字典为独立列，保持数组为字符串
         适用于：数据分析，需要字典字段独立访问
         """
-        flattened_data = []
+        parts = []
         
-        for idx, row in data.iterrows():
-            flat_row = {}
-            for col, value in row.items():
-                if isinstance(value, dict):
-                    # 展开字典
-                    for key, val in value.items():
-                        flat_row[f"{col}_{key}"] = val
-                elif isinstance(value, list):
-                    # 保持数组为字符串格式
-                    flat_row[col] = json.dumps(value, ensure_ascii=False)
-                else:
-                    flat_row[col] = value
-            flattened_data.append(flat_row)
+        for col in data.columns:
+            values = data[col]
+            if values.dtype != object:
+                # 非object列不可能包含字典或数组
+                parts.append(values)
+                continue
+            
+            dict_mask = values.map(lambda v: isinstance(v, dict))
+            if dict_mask.any():
+                # 展开字典：整列一次构造子表
+                dict_df = pd.DataFrame(
+                    [value if is_dict else {} for value, is_dict in zip(values, dict_mask)],
+                    index=data.index
+                )
+                dict_df.columns = [f"{col}_{key}" for key in dict_df.columns]
+                # 非字典的值仍保留在原列中
+                values = values.where(~dict_mask)
+                if values.notna().any():
+                    parts.append(self._dump_lists(values))
+                parts.append(dict_df)
+            else:
+                parts.append(self._dump_lists(values))
         
-        return pd.DataFrame(flattened_data)
+        return pd.concat(parts, axis=1) if parts else data.copy()
+    
+    def _dump_lists(self, values: pd.Series) -> pd.Series:
+        """将Series中的数组转换为JSON字符串（与最小化策略同样经由_serialize_complex，结果列类型一致）"""
+        list_mask = values.map(lambda v: isinstance(v, list))
+        if list_mask.any():
+            return _serialize_complex(values, list_mask)
+        return values
     
     def _normalize_arrays_strategy(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -88,32 +144,35 @@ class TidyDataConverterV2:
         将数组展开为多行，创建长格式数据
         适用于：统计建模、时间序列分析
         """
-        normalized_rows = []
+        # 找出所有数组列
+        array_columns = [
+            col for col in data.columns[data.dtypes == object]
+            if data[col].map(lambda v: isinstance(v, list)).any()
+        ]
+        if not array_columns:
+            return data.copy()
         
-        for idx, row in data.iterrows():
-            # 找出所有数组列
-            array_columns = []
-            for col, value in row.items():
-                if isinstance(value, list):
-                    array_columns.append(col)
-            
-            if not array_columns:
-                # 没有数组，直接添加行
-                normalized_rows.append(row.to_dict())
-            else:
-                # 有数组，需要展开
-                max_length = max(len(row[col]) for col in array_columns)
-                
-                for i in range(max_length):
-                    new_row = {}
-                    for col, value in row.items():
-                        if isinstance(value, list):
-                            new_row[col] = value[i] if i < len(value) else None
-                        else:
-                            new_row[col] = value
-                    normalized_rows.append(new_row)
+        # 每行展开的行数为该行所有数组的最大长度；不含数组的行保持1行
+        lengths = np.full(len(data), -1)
+        for col in array_columns:
+            col_lengths = data[col].map(lambda v: len(v) if isinstance(v, list) else -1)
+            lengths = np.maximum(lengths, col_lengths.to_numpy(dtype=int))
+        
+        # 由每行长度生成（源行号, 元素位置）索引映射；数组全为空的行重复0次即被丢弃
+        lengths = np.where(lengths < 0, 1, lengths)
+        source_rows = np.repeat(np.arange(len(data)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        positions = np.arange(len(source_rows)) - np.repeat(starts, lengths)
         
-        return pd.DataFrame(normalized_rows)
+        # 标量列按索引整体取值，数组列按位置取元素（越界补None，非数组的值重复）
+        normalized_df = data.iloc[source_rows].reset_index(drop=True)
+        for col in array_columns:
+            normalized_df[col] = [
+                (value[pos] if pos < len(value) else None) if isinstance(value, list) else value
+                for value, pos in zip(data[col].to_numpy()[source_rows], positions.tolist())
+            ]
+        
+        return normalized_df.infer_objects()
     
     def _full_flatten_strategy(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -121,82 +180,11 @@ class TidyDataConverterV2:
         展开所有复杂结构（字典和数组）
         适用于：机器学习、完全扁平化需求
         """
-        fully_flattened_data = []
-        
-        for idx, row in data.iterrows():
-            flat_row = {}
-            for col, value in row.items():
-                if isinstance(value, dict):
-                    # 展开字典
-                    for key, val in value.items():
-                        flat_row[f"{col}_{key}"] = val
-                elif isinstance(value, list):
-                    # 展开数组
-                    for i, item in enumerate(value):
-                        flat_row[f"{col}_{i}"] = item
-                else:
-                    flat_row[col] = value
-            fully_flattened_data.append(flat_row)
+        columns = list(data.columns)
+        rows = list(data.itertuples(index=False, name=None))
+        scalar_positions = frozenset(pos for pos, dtype in enumerate(data.dtypes) if dtype != object)
         
-        return pd.DataFrame(fully_flattened_data)
-    
-    def analyze_data_structure(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """分析数据结构，推荐最佳转换策略"""
-        analysis = {
-            "total_rows": len(data),
-            "total_columns": len(data.columns),
-            "complex_columns": [],
-            "array_columns": [],
-            "dict_columns": [],
-            "simple_columns": [],
-            "recommended_strategy": "minimal"
-        }
-        
-        for col in data.columns:
-            sample_values = data[col].dropna().head(5)
-            if len(sample_values) > 0:
-                first_value = sample_values.iloc[0]
-                
-                if isinstance(first_value, dict):
-                    analysis["dict_columns"].append(col)
-                    analysis["complex_columns"].append(col)
-                elif isinstance(first_value, list):
-                    analysis["array_columns"].append(col)
-                    analysis["complex_columns"].append(col)
-                else:
-                    analysis["simple_columns"].append(col)
-        
-        # 推荐策略
-        if len(analysis["complex_columns"]) == 0:
-            analysis["recommended_strategy"] = "minimal"
-        elif len(analysis["array_columns"]) > 0 and len(analysis["dict_columns"]) == 0:
-            analysis["recommended_strategy"] = "normalize_arrays"
-        elif len(analysis["dict_columns"]) > 0 and len(analysis["array_columns"]) == 0:
-            analysis["recommended_strategy"] = "flatten_dicts"
-        else:
-            analysis["recommended_strategy"] = "full_flatten"
-        
-        return analysis
-    
-    def get_strategy_description(self, strategy: str) -> str:
-        """获取策略描述"""
-        descriptions = {
-            'minimal': '最小化转换：保持原始结构，只将复杂对象转为JSON字符串',
-            'flatten_dicts': '扁平化字典：展开字典为独立列，保持数组为字符串',
-            'normalize_arrays': '标准化数组：将数组展开为多行，创建长格式数据',
-            'full_flatten': '完全扁平化：展开所有复杂结构（字典和数组）'
-        }
-        return descriptions.get(strategy, '未知策略')
-    
-    def get_strategy_use_case(self, strategy: str) -> str:
-        """获取策略适用场景"""
-        use_cases = {
-            'minimal': '数据交换、存储、保持原始语义',
-            'flatten_dicts': '数据分析、需要字典字段独立访问',
-            'normalize_arrays': '统计建模、时间序列分析',
-            'full_flatten': '机器学习、完全扁平化需求'
-        }
-        return use_cases.get(strategy, '未知场景')
+        return pd.DataFrame(_full_flatten_rows(columns, rows, scalar_positions))
 
 # 全局转换器实例
 tidy_converter_v2 = TidyDataConverterV2()
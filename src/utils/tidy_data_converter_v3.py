@@ -4,17 +4,37 @@
 """
 
 import pandas as pd
-import numpy as np
-import json
-from typing import Dict, Any, List, Optional, Tuple
 import logging
 
+from src.utils.tidy_data_converter_base import TidyDataConverterBase, _serialize_complex
+
 logger = logging.getLogger(__name__)
 
-class TidyDataConverterV3:
+class TidyDataConverterV3(TidyDataConverterBase):
     """整洁数据转换器 V3"""
     
+    DEFAULT_STRATEGY = 'normalize_only'
+    RECOMMENDED_STRATEGIES = {
+        'none': 'preserve_structure',
+        'arrays': 'normalize_explode',
+        'dicts': 'normalize_only',
+        'mixed': 'flatten_all'
+    }
+    STRATEGY_DESCRIPTIONS = {
+        'normalize_only': '仅标准化：展开嵌套字典，保持数组为列表格式',
+        'normalize_explode': '标准化+展开：展开嵌套字典，并将数组展开为多行（Tidy Data）',
+        'flatten_all': '完全扁平化：展开所有嵌套结构，包括字典和数组',
+        'preserve_structure': '保持结构：将复杂对象转换为JSON字符串，保持原始结构'
+    }
+    STRATEGY_USE_CASES = {
+        'normalize_only': '数据分析、需要访问嵌套字段',
+        'normalize_explode': '统计建模、时间序列分析、Tidy Data需求',
+        'flatten_all': '机器学习、完全扁平化需求',
+        'preserve_structure': '数据交换、存储、保持原始语义'
+    }
+    
     def __init__(self):
+        super().__init__()
         self.conversion_strategies = {
             'normalize_only': self._normalize_only_strategy,
             'normalize_explode': self._normalize_explode_strategy,
@@ -22,37 +42,43 @@ class TidyDataConverterV3:
             'preserve_structure': self._preserve_structure_strategy
         }
     
-    def convert_to_tidy_data(self, data: pd.DataFrame, strategy: str = 'normalize_only', **kwargs) -> pd.DataFrame:
-        """
-        将数据转换为整洁格式
-        
-        Args:
-            data: 原始DataFrame
-            strategy: 转换策略
-            **kwargs: 额外参数
-            
-        Returns:
-            pd.DataFrame: 整洁格式的数据
-        """
-        if strategy not in self.conversion_strategies:
-            raise ValueError(f"不支持的转换策略: {strategy}")
-        
-        return self.conversion_strategies[strategy](data, **kwargs)
-    
     def _normalize_only_strategy(self, data: pd.DataFrame, **kwargs) -> pd.DataFrame:
         """
         策略1: 仅标准化（使用pd.json_normalize）
         展开嵌套字典，保持数组为列表格式
         适用于：数据分析，需要访问嵌套字段
         """
-        # 将DataFrame转换为JSON格式，然后使用json_normalize
-        json_data = data.to_dict('records')
-        
-        # 使用pd.json_normalize展开嵌套结构
         separator = kwargs.get('separator', '.')
-        normalized_df = pd.json_normalize(json_data, sep=separator)
+        kinds = self._column_kinds(data)
+        parts = []
         
-        return normalized_df
+        # 逐列处理：只对含字典的列调用json_normalize，避免先把整表转为records
+        for col in data.columns:
+            values = data[col].reset_index(drop=True)
+            if kinds[col] == 'scalar':
+                parts.append(values)
+                continue
+            
+            dict_mask = values.map(lambda v: isinstance(v, dict))
+            if not dict_mask.any():
+                parts.append(values)
+                continue
+            
+            # 非字典的值仍保留在原列中
+            rest = values.where(~dict_mask)
+            if rest.notna().any():
+                parts.append(rest)
+            
+            # 使用pd.json_normalize展开嵌套结构
+            dict_df = pd.json_normalize(
+                [value if is_dict else {} for value, is_dict in zip(values, dict_mask)],
+                sep=separator
+            )
+            parts.append(dict_df.add_prefix(f"{col}{separator}"))
+        
+        if not parts:
+            return pd.DataFrame(index=range(len(data)))
+        return pd.concat(parts, axis=1)
     
     def _normalize_explode_strategy(self, data: pd.DataFrame, **kwargs) -> pd.DataFrame:
         """
@@ -64,10 +90,8 @@ class TidyDataConverterV3:
         normalized_df = self._normalize_only_strategy(data, **kwargs)
         
         # 找出包含列表的列
-        list_columns = []
-        for col in normalized_df.columns:
-            if normalized_df[col].apply(lambda x: isinstance(x, list)).any():
-                list_columns.append(col)
+        kinds = self._column_kinds(normalized_df)
+        list_columns = [col for col in normalized_df.columns if kinds[col] == 'list']
         
         if list_columns:
             # 展开第一个列表列
@@ -80,15 +104,18 @@ class TidyDataConverterV3:
                 # 将展开的字典列进一步标准化
                 separator = kwargs.get('separator', '.')
                 temp_df = exploded_df.drop(columns=[explode_col])
-                dict_data = exploded_df[explode_col].to_dict()
+                dict_data = [
+                    value if isinstance(value, dict) else {}
+                    for value in exploded_df[explode_col].tolist()
+                ]
                 
                 # 标准化字典数据
                 dict_df = pd.json_normalize(dict_data, sep=separator)
-                dict_df.index = temp_df.index
                 
-                # 合并结果
-                result_df = pd.concat([temp_df, dict_df], axis=1)
-                return result_df
+                # 直接按列写入结果，避免concat复制两侧数据
+                for col in dict_df.columns:
+                    temp_df[f"{explode_col}{separator}{col}"] = dict_df[col].to_numpy()
+                return temp_df
             
             return exploded_df
         
@@ -104,10 +131,8 @@ class TidyDataConverterV3:
         normalized_df = self._normalize_only_strategy(data, **kwargs)
         
         # 找出所有包含列表的列
-        list_columns = []
-        for col in normalized_df.columns:
-            if normalized_df[col].apply(lambda x: isinstance(x, list)).any():
-                list_columns.append(col)
+        kinds = self._column_kinds(normalized_df)
+        list_columns = [col for col in normalized_df.columns if kinds[col] == 'list']
         
         if list_columns:
             # 展开所有列表列
@@ -126,77 +151,22 @@ class TidyDataConverterV3:
         将复杂对象转换为JSON字符串，保持原始结构
         适用于：数据交换、存储
         """
-        preserved_data = []
+        # 没有任何字典或数组单元格时无需转换
+        kinds = self._column_kinds(data)
+        complex_columns = [col for col in data.columns if kinds[col] != 'scalar']
+        preserved_df = data.copy()
+        if not complex_columns:
+            return preserved_df
         
-        for idx, row in data.iterrows():
-            preserved_row = {}
-            for col, value in row.items():
-                if isinstance(value, (dict, list)):
-                    # 将复杂对象转换为JSON字符串
-                    preserved_row[col] = json.dumps(value, ensure_ascii=False)
-                else:
-                    preserved_row[col] = value
-            preserved_data.append(preserved_row)
+        # 只对含复杂对象的列按列整体序列化
+        for col in complex_columns:
+            values = preserved_df[col]
+            mask = values.map(lambda v: isinstance(v, (dict, list)))
+            if mask.any():
+                # 将复杂对象转换为JSON字符串
+                preserved_df[col] = _serialize_complex(values, mask)
         
-        return pd.DataFrame(preserved_data)
-    
-    def analyze_data_structure(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """分析数据结构，推荐最佳转换策略"""
-        analysis = {
-            "total_rows": len(data),
-            "total_columns": len(data.columns),
-            "complex_columns": [],
-            "array_columns": [],
-            "dict_columns": [],
-            "simple_columns": [],
-            "recommended_strategy": "normalize_only"
-        }
-        
-        for col in data.columns:
-            sample_values = data[col].dropna().head(5)
-            if len(sample_values) > 0:
-                first_value = sample_values.iloc[0]
-                
-                if isinstance(first_value, dict):
-                    analysis["dict_columns"].append(col)
-                    analysis["complex_columns"].append(col)
-                elif isinstance(first_value, list):
-                    analysis["array_columns"].append(col)
-                    analysis["complex_columns"].append(col)
-                else:
-                    analysis["simple_columns"].append(col)
-        
-        # 推荐策略
-        if len(analysis["complex_columns"]) == 0:
-            analysis["recommended_strategy"] = "preserve_structure"
-        elif len(analysis["array_columns"]) > 0 and len(analysis["dict_columns"]) == 0:
-            analysis["recommended_strategy"] = "normalize_explode"
-        elif len(analysis["dict_columns"]) > 0 and len(analysis["array_columns"]) == 0:
-            analysis["recommended_strategy"] = "normalize_only"
-        else:
-            analysis["recommended_strategy"] = "flatten_all"
-        
-        return analysis
-    
-    def get_strategy_description(self, strategy: str) -> str:
-        """获取策略描述"""
-        descriptions = {
-            'normalize_only': '仅标准化：展开嵌套字典，保持数组为列表格式',
-            'normalize_explode': '标准化+展开：展开嵌套字典，并将数组展开为多行（Tidy Data）',
-            'flatten_all': '完全扁平化：展开所有嵌套结构，包括字典和数组',
-            'preserve_structure': '保持结构：将复杂对象转换为JSON字符串，保持原始结构'
-        }
-        return descriptions.get(strategy, '未知策略')
-    
-    def get_strategy_use_case(self, strategy: str) -> str:
-        """获取策略适用场景"""
-        use_cases = {
-            'normalize_only': '数据分析、需要访问嵌套字段',
-            'normalize_explode': '统计建模、时间序列分析、Tidy Data需求',
-            'flatten_all': '机器学习、完全扁平化需求',
-            'preserve_structure': '数据交换、存储、保持原始语义'
-        }
-        return use_cases.get(strategy, '未知场景')
+        return preserved_df
 
 # 全局转换器实例
 tidy_converter_v3 = TidyDataConverterV3()
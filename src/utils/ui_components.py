@@ -1,25 +1,42 @@
 """
 响应式UI组件模块
 提供现代化的用户界面组件
+
+HTML片段按参数缓存（每个生成函数最多_HTML_CACHE_SIZE条，按LRU淘汰），
+适用于标题、配色等取值有限的输入；时间戳等高基数内容不宜直接拼入卡片参数
 """
 
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from typing import Dict, List, Any, Optional, Tuple, Union
-import time
-from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+import functools
+from string import Template
 
-class ModernUIComponents:
-    """现代化UI组件类"""
-    
-    @staticmethod
-    def create_hero_section(title: str, subtitle: str, background_color: str = "#1E40AF"):
-        """创建英雄区域"""
-        st.markdown(f"""
+
+class Colors:
+    """组件配色常量，各组件共用同一组字符串对象"""
+    PRIMARY = "#3B82F6"
+    PRIMARY_DARK = "#1E40AF"
+    TEXT = "#1F2937"
+    HEADING = "#374151"
+    MUTED = "#6B7280"
+    BORDER = "#E5E7EB"
+    SUCCESS = "#10B981"
+    ERROR = "#EF4444"
+    WARN = "#F59E0B"
+
+
+# 静态HTML片段缓存：相同参数重复渲染时直接复用已生成的字符串，条目数有上限以免内存持续增长
+_HTML_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=_HTML_CACHE_SIZE)
+def _build_hero_html(title: str, subtitle: str, background_color: str) -> str:
+    """生成英雄区域HTML"""
+    return f"""
         <div style="
-            background: linear-gradient(135deg, {background_color} 0%, #3B82F6 100%);
+            background: linear-gradient(135deg, {background_color} 0%, {Colors.PRIMARY} 100%);
             padding: 40px 20px;
             border-radius: 20px;
             color: white;
@@ -41,97 +58,104 @@ class ModernUIComponents:
                 margin: 0 auto;
             ">{subtitle}</p>
         </div>
-        """, unsafe_allow_html=True)
-    
-    @staticmethod
-    def create_feature_card(title: str, description: str, icon: str, 
-                          color: str = "#3B82F6", action_button: str = None):
-        """创建功能卡片"""
-        card_html = f"""
-        <div style="
+        """
+
+
+@functools.lru_cache(maxsize=_HTML_CACHE_SIZE)
+def _build_feature_card_html(title: str, description: str, icon: str,
+                             color: str, action_button: Optional[str]) -> str:
+    """生成功能卡片HTML"""
+    # 悬停效果由FEATURE_CARD_CSS中的:hover规则提供（st.html会移除onmouseover等内联事件）
+    card_html = f"""
+        <div class="feature-card" style="
             background: white;
             border-radius: 15px;
             padding: 25px;
             margin: 15px 0;
-            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
             border-left: 5px solid {color};
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
             cursor: pointer;
-        " onmouseover="this.style.transform='translateY(-5px)'; this.style.boxShadow='0 8px 30px rgba(0,0,0,0.15)'"
-           onmouseout="this.style.transform='translateY(0)'; this.style.boxShadow='0 4px 20px rgba(0,0,0,0.1)'">
+        ">
             <div style="display: flex; align-items: center; margin-bottom: 15px;">
                 <span style="font-size: 2rem; margin-right: 15px;">{icon}</span>
-                <h3 style="margin: 0; color: #1F2937; font-size: 1.3rem;">{title}</h3>
+                <h3 style="margin: 0; color: {Colors.TEXT}; font-size: 1.3rem;">{title}</h3>
             </div>
-            <p style="color: #6B7280; line-height: 1.6; margin: 0;">{description}</p>
+            <p style="color: {Colors.MUTED}; line-height: 1.6; margin: 0;">{description}</p>
         </div>
         """
-        
-        if action_button:
-            card_html += f"""
+    
+    if action_button:
+        card_html += f"""
             <div style="text-align: center; margin-top: 15px;">
-                <button style="
-                    background: {color};
+                <button class="feature-card-button" style="
+                    --button-bg: {color};
+                    --button-bg-hover: {color}dd;
                     color: white;
                     border: none;
                     padding: 10px 20px;
                     border-radius: 8px;
                     cursor: pointer;
                     font-weight: 500;
-                    transition: background 0.3s ease;
-                " onmouseover="this.style.background='{color}dd'" onmouseout="this.style.background='{color}'">
+                ">
                     {action_button}
                 </button>
             </div>
             """
-        
-        st.markdown(card_html, unsafe_allow_html=True)
     
-    @staticmethod
-    def create_progress_card(title: str, current: int, total: int, 
-                           color: str = "#10B981", show_percentage: bool = True):
-        """创建进度卡片"""
-        percentage = (current / total) * 100 if total > 0 else 0
-        
-        st.markdown(f"""
-        <div style="
-            background: white;
-            border-radius: 12px;
-            padding: 20px;
-            margin: 10px 0;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        ">
-            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                <h4 style="margin: 0; color: #374151;">{title}</h4>
-                <span style="color: #6B7280; font-size: 0.9rem;">
-                    {current}/{total} {f"({percentage:.1f}%)" if show_percentage else ""}
-                </span>
-            </div>
-            <div style="
-                background: #E5E7EB;
-                border-radius: 10px;
-                height: 8px;
-                overflow: hidden;
-            ">
-                <div style="
-                    background: {color};
-                    height: 100%;
-                    width: {percentage}%;
-                    border-radius: 10px;
-                    transition: width 0.5s ease;
-                "></div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    return card_html
+
+
+# 进度条模板：导入时编译一次，进度更新时只做占位符替换，输出紧凑的单行HTML
+_PROGRESS_TPL = Template(
+    '<div style="background: white; border-radius: 12px; padding: 20px; margin: 10px 0; '
+    'box-shadow: 0 2px 10px rgba(0,0,0,0.1);">'
+    '<div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">'
+    f'<h4 style="margin: 0; color: {Colors.HEADING};">$title</h4>'
+    f'<span style="color: {Colors.MUTED}; font-size: 0.9rem;">$current/$total $percentage_text</span>'
+    '</div>'
+    f'<div style="background: {Colors.BORDER}; border-radius: 10px; height: 8px; overflow: hidden;">'
+    '<div style="background: $color; height: 100%; width: $percentage%; border-radius: 10px; '
+    'transition: width 0.5s ease;"></div>'
+    '</div>'
+    '</div>'
+)
+
+_PROGRESS_MESSAGE_TPL = Template(
+    '<div style="background: white; border-radius: 12px; padding: 20px; margin: 20px 0; text-align: center;">'
+    f'<p style="margin: 0 0 15px 0; color: {Colors.HEADING};">$message</p>'
+    f'<div style="background: {Colors.BORDER}; border-radius: 10px; height: 8px; overflow: hidden;">'
+    f'<div style="background: {Colors.PRIMARY}; height: 100%; width: $progress%; border-radius: 10px; '
+    'transition: width 0.3s ease;"></div>'
+    '</div>'
+    f'<p style="margin: 10px 0 0 0; color: {Colors.MUTED}; font-size: 0.9rem;">$progress_text% 完成</p>'
+    '</div>'
+)
+
+
+@functools.lru_cache(maxsize=_HTML_CACHE_SIZE)
+def _build_progress_card_html(title: str, current: int, total: int,
+                              color: str, show_percentage: bool) -> str:
+    """生成进度卡片HTML"""
+    # total为0时按1计算，结果限制在0~100之间
+    percentage = min(100.0, max(0.0, 100.0 * current / max(total, 1)))
     
-    @staticmethod
-    def create_metric_card(title: str, value: str, change: str = None, 
-                          change_type: str = "positive", icon: str = "📊"):
-        """创建指标卡片"""
-        change_color = "#10B981" if change_type == "positive" else "#EF4444"
-        change_icon = "↗️" if change_type == "positive" else "↘️"
-        
-        st.markdown(f"""
+    return _PROGRESS_TPL.substitute(
+        title=title,
+        current=current,
+        total=total,
+        percentage_text=f"({percentage:.1f}%)" if show_percentage else "",
+        color=color,
+        percentage=percentage
+    )
+
+
+@functools.lru_cache(maxsize=_HTML_CACHE_SIZE)
+def _build_metric_card_html(title: str, value: str, change: Optional[str],
+                            change_type: str, icon: str) -> str:
+    """生成指标卡片HTML"""
+    change_color = Colors.SUCCESS if change_type == "positive" else Colors.ERROR
+    change_icon = "↗️" if change_type == "positive" else "↘️"
+    
+    return f"""
         <div style="
             background: white;
             border-radius: 12px;
@@ -141,26 +165,35 @@ class ModernUIComponents:
             text-align: center;
         ">
             <div style="font-size: 2rem; margin-bottom: 10px;">{icon}</div>
-            <h3 style="margin: 0; color: #1F2937; font-size: 1.8rem; font-weight: bold;">{value}</h3>
-            <p style="margin: 5px 0; color: #6B7280; font-size: 0.9rem;">{title}</p>
+            <h3 style="margin: 0; color: {Colors.TEXT}; font-size: 1.8rem; font-weight: bold;">{value}</h3>
+            <p style="margin: 5px 0; color: {Colors.MUTED}; font-size: 0.9rem;">{title}</p>
             {f'<p style="margin: 0; color: {change_color}; font-size: 0.8rem;">{change_icon} {change}</p>' if change else ''}
         </div>
-        """, unsafe_allow_html=True)
-    
-    @staticmethod
-    def create_alert_box(message: str, alert_type: str = "info", 
-                        title: str = None, dismissible: bool = True):
-        """创建警告框"""
-        colors = {
-            "info": {"bg": "#DBEAFE", "border": "#3B82F6", "text": "#1E40AF"},
-            "success": {"bg": "#D1FAE5", "border": "#10B981", "text": "#065F46"},
-            "warning": {"bg": "#FEF3C7", "border": "#F59E0B", "text": "#92400E"},
-            "error": {"bg": "#FEE2E2", "border": "#EF4444", "text": "#991B1B"}
-        }
-        
-        color = colors.get(alert_type, colors["info"])
-        
-        st.markdown(f"""
+        """
+
+
+# 警告框配色
+_ALERT_COLORS = {
+    "info": {"bg": "#DBEAFE", "border": Colors.PRIMARY, "text": Colors.PRIMARY_DARK},
+    "success": {"bg": "#D1FAE5", "border": Colors.SUCCESS, "text": "#065F46"},
+    "warning": {"bg": "#FEF3C7", "border": Colors.WARN, "text": "#92400E"},
+    "error": {"bg": "#FEE2E2", "border": Colors.ERROR, "text": "#991B1B"}
+}
+
+
+# 警告框标题与关闭按钮片段
+_ALERT_TITLE_TPL = '<h4 style="margin: 0 0 5px 0; font-size: 1rem;">{}</h4>'
+_DISMISS_BUTTONS = {
+    alert_type: f'<button style="background: none; border: none; color: {color["text"]}; cursor: pointer; font-size: 1.2rem;">×</button>'
+    for alert_type, color in _ALERT_COLORS.items()
+}
+
+
+def _alert_template(alert_type: str, dismissible: bool) -> str:
+    """按类型生成警告框模板，仅保留{title_block}与{message}两个占位符"""
+    color = _ALERT_COLORS[alert_type]
+    dismiss_button = _DISMISS_BUTTONS[alert_type] if dismissible else ''
+    return f"""
         <div style="
             background: {color['bg']};
             border: 1px solid {color['border']};
@@ -171,87 +204,208 @@ class ModernUIComponents:
         ">
             <div style="display: flex; align-items: center; justify-content: space-between;">
                 <div>
-                    {f'<h4 style="margin: 0 0 5px 0; font-size: 1rem;">{title}</h4>' if title else ''}
-                    <p style="margin: 0; line-height: 1.5;">{message}</p>
+                    {{title_block}}
+                    <p style="margin: 0; line-height: 1.5;">{{message}}</p>
                 </div>
-                {f'<button style="background: none; border: none; color: {color["text"]}; cursor: pointer; font-size: 1.2rem;">×</button>' if dismissible else ''}
+                {dismiss_button}
             </div>
         </div>
-        """, unsafe_allow_html=True)
-    
-    @staticmethod
-    def create_tab_navigation(tabs: List[Dict[str, str]], active_tab: str = None):
-        """创建标签导航"""
-        tab_html = '<div style="display: flex; background: #F3F4F6; border-radius: 8px; padding: 4px; margin: 20px 0;">'
-        
-        for tab in tabs:
-            is_active = tab["id"] == active_tab
-            tab_html += f"""
-            <div style="
-                flex: 1;
-                text-align: center;
-                padding: 10px;
-                border-radius: 6px;
-                cursor: pointer;
-                transition: all 0.3s ease;
-                background: {'white' if is_active else 'transparent'};
-                color: {'#1F2937' if is_active else '#6B7280'};
-                font-weight: {'600' if is_active else '400'};
-                box-shadow: {'0 2px 4px rgba(0,0,0,0.1)' if is_active else 'none'};
-            ">
-                {tab["icon"]} {tab["label"]}
-            </div>
-            """
-        
-        tab_html += '</div>'
-        st.markdown(tab_html, unsafe_allow_html=True)
+        """
 
-class InteractiveComponents:
-    """交互式组件类"""
+
+# 各类型警告框模板在导入时生成：alert_type -> (不可关闭模板, 可关闭模板)
+_ALERT_TPLS = {
+    alert_type: (_alert_template(alert_type, False), _alert_template(alert_type, True))
+    for alert_type in _ALERT_COLORS
+}
+
+
+@functools.lru_cache(maxsize=_HTML_CACHE_SIZE)
+def _build_alert_box_html(message: str, alert_type: str, title: Optional[str], dismissible: bool) -> str:
+    """生成警告框HTML"""
+    template = _ALERT_TPLS.get(alert_type, _ALERT_TPLS["info"])[bool(dismissible)]
+    title_block = _ALERT_TITLE_TPL.format(title) if title else ''
+    return template.format(title_block=title_block, message=message)
+
+
+# 单个标签的模板，样式由TABNAV_CSS中的类提供
+_TAB_TPL = '<div class="tab {cls}">{icon} {label}</div>'
+
+
+@functools.lru_cache(maxsize=_HTML_CACHE_SIZE)
+def _build_tab_nav_html(tabs: Tuple[Tuple[Tuple[str, str], ...], ...], active_tab: Optional[str]) -> str:
+    """生成标签导航HTML，tabs为各标签字典items组成的元组"""
+    parts = ['<div class="tabbar">']
+    append = parts.append
+    render_tab = _TAB_TPL.format
+    for items in tabs:
+        tab = dict(items)
+        append(render_tab(
+            cls="tab-active" if tab["id"] == active_tab else "",
+            icon=tab["icon"],
+            label=tab["label"]
+        ))
+    append('</div>')
+    return "".join(parts)
+
+
+def hero_section(title: str, subtitle: str, background_color: str = Colors.PRIMARY_DARK):
+    """创建英雄区域"""
+    st.html(_build_hero_html(title, subtitle, background_color))
+
+
+def feature_card(title: str, description: str, icon: str,
+                 color: str = Colors.PRIMARY, action_button: str = None):
+    """创建功能卡片"""
+    _inject_css(FEATURE_CARD_CSS, _build_feature_card_html(title, description, icon, color, action_button))
+
+
+def progress_card(title: str, current: int, total: int,
+                  color: str = Colors.SUCCESS, show_percentage: bool = True, placeholder=None):
+    """
+    创建进度卡片
+    循环中更新进度时传入同一个st.empty()占位符，卡片原地替换而不是逐次追加新元素
+    """
+    target = placeholder if placeholder is not None else st
+    target.html(_build_progress_card_html(title, current, total, color, show_percentage))
+
+
+def metric_card(title: str, value: str, change: str = None,
+                change_type: str = "positive", icon: str = "📊"):
+    """创建指标卡片"""
+    st.html(_build_metric_card_html(title, value, change, change_type, icon))
+
+
+def alert_box(message: str, alert_type: str = "info",
+              title: str = None, dismissible: bool = True):
+    """创建警告框"""
+    st.html(_build_alert_box_html(message, alert_type, title, dismissible))
+
+
+def _join_fragments(fragments) -> str:
+    """将多个HTML片段去掉缩进与换行后拼接，减少批量渲染时发送的字节数"""
+    return "".join(" ".join(line.strip() for line in fragment.splitlines() if line.strip()) for fragment in fragments)
+
+
+def feature_cards(cards: List[Dict[str, Any]]):
+    """批量创建功能卡片，所有卡片合并为一次st.html；cards中每项的键与feature_card参数相同"""
+    html = _join_fragments(
+        _build_feature_card_html(card["title"], card["description"], card["icon"],
+                                 card.get("color", Colors.PRIMARY), card.get("action_button"))
+        for card in cards
+    )
+    _inject_css(FEATURE_CARD_CSS, html)
+
+
+def metric_cards(cards: List[Dict[str, Any]]):
+    """批量创建指标卡片并横向排列，所有卡片合并为一次st.html；cards中每项的键与metric_card参数相同"""
+    html = _join_fragments(
+        '<div style="flex: 1; min-width: 160px;">'
+        + _build_metric_card_html(card["title"], card["value"], card.get("change"),
+                                  card.get("change_type", "positive"), card.get("icon", "📊"))
+        + '</div>'
+        for card in cards
+    )
+    st.html(f'<div style="display: flex; gap: 20px; flex-wrap: wrap;">{html}</div>')
+
+
+def alert_boxes(alerts: List[Dict[str, Any]]):
+    """批量创建警告框，所有警告框合并为一次st.html；alerts中每项的键与alert_box参数相同"""
+    html = _join_fragments(
+        _build_alert_box_html(alert["message"], alert.get("alert_type", "info"),
+                              alert.get("title"), alert.get("dismissible", True))
+        for alert in alerts
+    )
+    st.html(html)
+
+
+def tab_navigation(tabs: List[Dict[str, str]], active_tab: str = None):
+    """创建标签导航"""
+    tab_items = tuple(tuple(tab.items()) for tab in tabs)
+    _inject_css(TABNAV_CSS, _build_tab_nav_html(tab_items, active_tab))
+
+
+class ModernUIComponents:
+    """现代化UI组件类，保留原有调用方式；新代码可直接调用模块级函数"""
     
-    @staticmethod
-    def create_draggable_dataframe(df: pd.DataFrame, key: str = "dataframe"):
-        """创建可拖拽的数据表格"""
-        st.markdown("""
+    create_hero_section = staticmethod(hero_section)
+    create_feature_card = staticmethod(feature_card)
+    create_progress_card = staticmethod(progress_card)
+    create_metric_card = staticmethod(metric_card)
+    create_alert_box = staticmethod(alert_box)
+    create_tab_navigation = staticmethod(tab_navigation)
+    create_feature_cards = staticmethod(feature_cards)
+    create_metric_cards = staticmethod(metric_cards)
+    create_alert_boxes = staticmethod(alert_boxes)
+
+# 静态样式表：模块级常量，渲染时不做任何字符串插值
+FEATURE_CARD_CSS = """
         <style>
-        .dataframe-container {
-            border: 2px dashed #E5E7EB;
+        .feature-card {
+            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
+            transition: transform 0.3s ease, box-shadow 0.3s ease;
+        }
+        .feature-card:hover {
+            transform: translateY(-5px);
+            box-shadow: 0 8px 30px rgba(0,0,0,0.15);
+        }
+        .feature-card-button {
+            background: var(--button-bg);
+            transition: background 0.3s ease;
+        }
+        .feature-card-button:hover {
+            background: var(--button-bg-hover);
+        }
+        </style>
+"""
+
+TABNAV_CSS = f"""
+        <style>
+        .tabbar {{
+            display: flex;
+            background: #F3F4F6;
+            border-radius: 8px;
+            padding: 4px;
+            margin: 20px 0;
+        }}
+        .tabbar .tab {{
+            flex: 1;
+            text-align: center;
+            padding: 10px;
+            border-radius: 6px;
+            cursor: pointer;
+            transition: all 0.3s ease;
+            background: transparent;
+            color: {Colors.MUTED};
+            font-weight: 400;
+            box-shadow: none;
+        }}
+        .tabbar .tab-active {{
+            background: white;
+            color: {Colors.TEXT};
+            font-weight: 600;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }}
+        </style>
+"""
+
+DRAG_CSS = f"""
+        <style>
+        .dataframe-container {{
+            border: 2px dashed {Colors.BORDER};
             border-radius: 8px;
             padding: 20px;
             text-align: center;
             margin: 20px 0;
             transition: border-color 0.3s ease;
-        }
-        .dataframe-container:hover {
-            border-color: #3B82F6;
-        }
+        }}
+        .dataframe-container:hover {{
+            border-color: {Colors.PRIMARY};
+        }}
         </style>
-        """, unsafe_allow_html=True)
-        
-        st.markdown(f"""
-        <div class="dataframe-container" id="{key}">
-            <p style="color: #6B7280; margin: 0;">拖拽数据文件到这里或点击上传</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        return st.file_uploader("选择文件", type=['csv', 'xlsx', 'xls'], key=key)
-    
-    @staticmethod
-    def create_animated_chart(fig, animation_duration: int = 1000):
-        """创建动画图表"""
-        # 为图表添加动画效果
-        fig.update_layout(
-            transition={
-                'duration': animation_duration,
-                'easing': 'cubic-in-out'
-            }
-        )
-        return fig
-    
-    @staticmethod
-    def create_floating_action_button(icon: str, tooltip: str, key: str):
-        """创建浮动操作按钮"""
-        st.markdown(f"""
+"""
+
+FAB_CSS = f"""
         <style>
         .fab {{
             position: fixed;
@@ -259,7 +413,7 @@ class InteractiveComponents:
             right: 20px;
             width: 56px;
             height: 56px;
-            background: #3B82F6;
+            background: {Colors.PRIMARY};
             border-radius: 50%;
             display: flex;
             align-items: center;
@@ -270,16 +424,128 @@ class InteractiveComponents:
             box-shadow: 0 4px 12px rgba(59, 130, 246, 0.4);
             transition: all 0.3s ease;
             z-index: 1000;
+            contain: strict;
         }}
         .fab:hover {{
             transform: scale(1.1);
             box-shadow: 0 6px 20px rgba(59, 130, 246, 0.6);
         }}
         </style>
+"""
+
+SKELETON_CSS = f"""
+        <style>
+        @keyframes pulse {{
+            0% {{ opacity: 1; }}
+            50% {{ opacity: 0.5; }}
+            100% {{ opacity: 1; }}
+        }}
+        .skeleton-card {{
+            background: white;
+            border-radius: 12px;
+            padding: 20px;
+            margin: 20px 0;
+        }}
+        .skeleton {{
+            background: {Colors.BORDER};
+            border-radius: 4px;
+            animation: pulse 1.5s infinite;
+        }}
+        </style>
+"""
+
+LIGHT_CSS = f"""
+        <style>
+        .stApp {{
+            background-color: #F9FAFB;
+        }}
+        .stButton > button {{
+            background-color: {Colors.PRIMARY};
+            color: white;
+            border-radius: 8px;
+            border: none;
+            padding: 10px 20px;
+            font-weight: 500;
+            transition: all 0.3s ease;
+        }}
+        .stButton > button:hover {{
+            background-color: #2563EB;
+            transform: translateY(-1px);
+        }}
+        .stSelectbox > div > div {{
+            border-radius: 8px;
+            border: 1px solid #D1D5DB;
+        }}
+        </style>
+"""
+
+DARK_CSS = f"""
+        <style>
+        .stApp {{
+            background-color: #111827;
+            color: #F9FAFB;
+        }}
+        .stButton > button {{
+            background-color: {Colors.PRIMARY};
+            color: white;
+            border-radius: 8px;
+            border: none;
+            padding: 10px 20px;
+            font-weight: 500;
+        }}
+        .stSelectbox > div > div {{
+            background-color: {Colors.HEADING};
+            border-radius: 8px;
+            border: 1px solid #4B5563;
+            color: #F9FAFB;
+        }}
+        </style>
+"""
+
+
+def _inject_css(css: str, html: str = ""):
+    """
+    输出静态样式表，html为紧随其后的组件标记，与样式合并为一次st.html发送
+    Streamlit会移除重跑时未再次输出的元素，因此样式需在每次运行时输出，不能只在会话内注入一次
+    """
+    st.html(css + html)
+
+
+@functools.lru_cache(maxsize=16)
+def _transition(duration: int) -> go.layout.Transition:
+    """按时长缓存已校验的图表过渡配置，Plotly赋值时会复制该对象，共享是安全的"""
+    return go.layout.Transition(duration=duration, easing='cubic-in-out')
+
+
+class InteractiveComponents:
+    """交互式组件类"""
+    
+    @staticmethod
+    def create_draggable_dataframe(df: pd.DataFrame, key: str = "dataframe"):
+        """创建可拖拽的数据表格"""
+        _inject_css(DRAG_CSS, f"""
+        <div class="dataframe-container" id="{key}">
+            <p style="color: {Colors.MUTED}; margin: 0;">拖拽数据文件到这里或点击上传</p>
+        </div>
+        """)
+        
+        return st.file_uploader("选择文件", type=['csv', 'xlsx', 'xls'], key=key)
+    
+    @staticmethod
+    def create_animated_chart(fig, animation_duration: int = 1000):
+        """创建动画图表"""
+        # 为图表添加动画效果：直接赋值已校验的过渡对象，跳过update_layout的整体合并
+        fig.layout.transition = _transition(animation_duration)
+        return fig
+    
+    @staticmethod
+    def create_floating_action_button(icon: str, tooltip: str, key: str):
+        """创建浮动操作按钮"""
+        _inject_css(FAB_CSS, f"""
         <div class="fab" title="{tooltip}">
             {icon}
         </div>
-        """, unsafe_allow_html=True)
+        """)
         
         return st.button(icon, key=key)
 
@@ -289,9 +555,9 @@ class ResponsiveLayout:
     @staticmethod
     def create_sidebar_navigation():
         """创建侧边栏导航"""
-        st.sidebar.markdown("""
+        st.sidebar.html(f"""
         <div style="
-            background: linear-gradient(135deg, #1E40AF 0%, #3B82F6 100%);
+            background: linear-gradient(135deg, {Colors.PRIMARY_DARK} 0%, {Colors.PRIMARY} 100%);
             padding: 20px;
             border-radius: 12px;
             color: white;
@@ -302,12 +568,12 @@ class ResponsiveLayout:
                 智能数据分析平台
             </p>
         </div>
-        """, unsafe_allow_html=True)
+        """)
     
     @staticmethod
     def create_main_content_area():
         """创建主内容区域"""
-        st.markdown("""
+        st.html("""
         <style>
         .main-content {
             padding: 20px;
@@ -322,7 +588,7 @@ class ResponsiveLayout:
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
         }
         </style>
-        """, unsafe_allow_html=True)
+        """)
     
     @staticmethod
     def create_grid_layout(columns: int = 2):
@@ -332,14 +598,14 @@ class ResponsiveLayout:
     @staticmethod
     def create_flexible_container():
         """创建灵活容器"""
-        st.markdown("""
+        st.html("""
         <div style="
             display: flex;
             flex-wrap: wrap;
             gap: 20px;
             margin: 20px 0;
         ">
-        """, unsafe_allow_html=True)
+        """)
 
 class LoadingStates:
     """加载状态类"""
@@ -347,76 +613,22 @@ class LoadingStates:
     @staticmethod
     def show_skeleton_loading():
         """显示骨架屏加载"""
-        st.markdown("""
-        <div style="
-            background: white;
-            border-radius: 12px;
-            padding: 20px;
-            margin: 20px 0;
-        ">
-            <div style="
-                background: #E5E7EB;
-                height: 20px;
-                border-radius: 4px;
-                margin-bottom: 15px;
-                animation: pulse 1.5s infinite;
-            "></div>
-            <div style="
-                background: #E5E7EB;
-                height: 15px;
-                border-radius: 4px;
-                margin-bottom: 10px;
-                width: 80%;
-                animation: pulse 1.5s infinite;
-            "></div>
-            <div style="
-                background: #E5E7EB;
-                height: 15px;
-                border-radius: 4px;
-                width: 60%;
-                animation: pulse 1.5s infinite;
-            "></div>
-        </div>
-        <style>
-        @keyframes pulse {
-            0% { opacity: 1; }
-            50% { opacity: 0.5; }
-            100% { opacity: 1; }
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        _inject_css(
+            SKELETON_CSS,
+            '<div class="skeleton-card">'
+            '<div class="skeleton" style="height: 20px; margin-bottom: 15px;"></div>'
+            '<div class="skeleton" style="height: 15px; margin-bottom: 10px; width: 80%;"></div>'
+            '<div class="skeleton" style="height: 15px; width: 60%;"></div>'
+            '</div>'
+        )
     
     @staticmethod
-    def show_progress_with_message(message: str, progress: float):
-        """显示带消息的进度条"""
-        st.markdown(f"""
-        <div style="
-            background: white;
-            border-radius: 12px;
-            padding: 20px;
-            margin: 20px 0;
-            text-align: center;
-        ">
-            <p style="margin: 0 0 15px 0; color: #374151;">{message}</p>
-            <div style="
-                background: #E5E7EB;
-                border-radius: 10px;
-                height: 8px;
-                overflow: hidden;
-            ">
-                <div style="
-                    background: #3B82F6;
-                    height: 100%;
-                    width: {progress}%;
-                    border-radius: 10px;
-                    transition: width 0.3s ease;
-                "></div>
-            </div>
-            <p style="margin: 10px 0 0 0; color: #6B7280; font-size: 0.9rem;">
-                {progress:.1f}% 完成
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+    def show_progress_with_message(message: str, progress: float, placeholder=None):
+        """显示带消息的进度条，placeholder用法同progress_card"""
+        progress = min(100.0, max(0.0, progress))
+        html = _PROGRESS_MESSAGE_TPL.substitute(message=message, progress=progress, progress_text=f"{progress:.1f}")
+        target = placeholder if placeholder is not None else st
+        target.html(html)
 
 class ThemeManager:
     """主题管理器"""
@@ -424,82 +636,37 @@ class ThemeManager:
     @staticmethod
     def apply_light_theme():
         """应用浅色主题"""
-        st.markdown("""
-        <style>
-        .stApp {
-            background-color: #F9FAFB;
-        }
-        .stButton > button {
-            background-color: #3B82F6;
-            color: white;
-            border-radius: 8px;
-            border: none;
-            padding: 10px 20px;
-            font-weight: 500;
-            transition: all 0.3s ease;
-        }
-        .stButton > button:hover {
-            background-color: #2563EB;
-            transform: translateY(-1px);
-        }
-        .stSelectbox > div > div {
-            border-radius: 8px;
-            border: 1px solid #D1D5DB;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        _inject_css(LIGHT_CSS)
     
     @staticmethod
     def apply_dark_theme():
         """应用深色主题"""
-        st.markdown("""
-        <style>
-        .stApp {
-            background-color: #111827;
-            color: #F9FAFB;
-        }
-        .stButton > button {
-            background-color: #3B82F6;
-            color: white;
-            border-radius: 8px;
-            border: none;
-            padding: 10px 20px;
-            font-weight: 500;
-        }
-        .stSelectbox > div > div {
-            background-color: #374151;
-            border-radius: 8px;
-            border: 1px solid #4B5563;
-            color: #F9FAFB;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        _inject_css(DARK_CSS)
 
 # 便捷函数
+# 组件类只包含静态方法、不持有状态，实例可在重跑和会话之间安全复用
+@st.cache_resource(show_spinner=False)
 def create_modern_ui():
     """创建现代化UI"""
-    ui = ModernUIComponents()
-    return ui
+    return ModernUIComponents()
 
+@st.cache_resource(show_spinner=False)
 def create_interactive_ui():
     """创建交互式UI"""
-    interactive = InteractiveComponents()
-    return interactive
+    return InteractiveComponents()
 
+@st.cache_resource(show_spinner=False)
 def create_responsive_layout():
     """创建响应式布局"""
-    layout = ResponsiveLayout()
-    return layout
+    return ResponsiveLayout()
 
 def show_loading_state():
     """显示加载状态"""
-    loading = LoadingStates()
-    loading.show_skeleton_loading()
+    LoadingStates.show_skeleton_loading()
 
 def apply_theme(theme: str = "light"):
     """应用主题"""
-    theme_manager = ThemeManager()
     if theme == "dark":
-        theme_manager.apply_dark_theme()
+        ThemeManager.apply_dark_theme()
     else:
-        theme_manager.apply_light_theme()
+        ThemeManager.apply_light_theme()
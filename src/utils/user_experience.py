@@ -4,214 +4,145 @@
 """
 
 import streamlit as st
-import pandas as pd
-from typing import Dict, List, Optional, Any, Callable
+import numpy as np
+from typing import Dict, List, Optional, Any, Tuple, Final
 import json
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
+import logging
+import threading
+import contextlib
+import textwrap
+import heapq
+import itertools
+from dataclasses import dataclass
 
-class UserGuide:
-    """用户引导系统"""
-    
-    def __init__(self):
-        self.guides = {
-            "数据上传": {
-                "title": "📁 数据上传指南",
-                "steps": [
-                    "选择支持的文件格式（CSV、Excel、JSON、Parquet）",
-                    "确保数据格式整洁，编码为UTF-8",
-                    "避免特殊字符在列名中",
-                    "建议文件大小不超过100MB"
-                ],
-                "tips": [
-                    "💡 首次使用建议上传小型数据集进行测试",
-                    "💡 检查数据是否包含表头",
-                    "💡 确保数值列格式正确"
-                ]
-            },
-            "数据清洗": {
-                "title": "🧹 数据清洗指南",
-                "steps": [
-                    "检查并处理缺失值",
-                    "删除重复行",
-                    "处理异常值",
-                    "标准化数据格式"
-                ],
-                "tips": [
-                    "💡 缺失值处理前先分析缺失模式",
-                    "💡 异常值处理要结合业务背景",
-                    "💡 保留原始数据备份"
-                ]
-            },
-            "可视化": {
-                "title": "📈 可视化指南",
-                "steps": [
-                    "选择合适的图表类型",
-                    "设置合适的颜色方案",
-                    "添加标题和标签",
-                    "优化图表布局"
-                ],
-                "tips": [
-                    "💡 柱状图适合分类数据比较",
-                    "💡 散点图适合相关性分析",
-                    "💡 时间序列图适合趋势分析"
-                ]
-            },
-            "机器学习": {
-                "title": "🤖 机器学习指南",
-                "steps": [
-                    "选择合适的问题类型（分类/回归/聚类）",
-                    "准备特征和目标变量",
-                    "选择合适的算法",
-                    "评估模型性能"
-                ],
-                "tips": [
-                    "💡 分类问题需要分类型目标变量",
-                    "💡 回归问题需要数值型目标变量",
-                    "💡 特征工程能显著提升模型性能"
-                ]
-            }
-        }
-    
-    def show_guide(self, guide_key: str):
-        """显示用户引导"""
-        if guide_key not in self.guides:
-            st.warning("未找到对应的引导信息")
-            return
-        
-        guide = self.guides[guide_key]
-        
-        st.markdown(f"## {guide['title']}")
-        
-        st.markdown("### 📋 操作步骤")
-        for i, step in enumerate(guide['steps'], 1):
-            st.markdown(f"{i}. {step}")
-        
-        st.markdown("### 💡 实用技巧")
-        for tip in guide['tips']:
-            st.markdown(tip)
-    
-    def show_quick_tips(self):
-        """显示快速提示"""
-        st.sidebar.markdown("### 💡 快速提示")
-        
-        tips = [
-            "🎯 使用AI助手获取专业建议",
-            "📊 尝试不同的可视化类型",
-            "🔍 利用数据洞察功能深入分析",
-            "⚡ 大数据集可使用性能优化功能"
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+# 功能评分项：(名称, 滑块key)
+_RATING_SPECS: Final[Tuple[Tuple[str, str], ...]] = (
+    ("数据上传", "rating_upload"),
+    ("数据清洗", "rating_cleaning"),
+    ("可视化", "rating_viz"),
+    ("机器学习", "rating_ml"),
+    ("AI助手", "rating_ai")
+)
+
+# 反馈文件解析结果缓存：绝对路径 -> (文件修改时间st_mtime_ns, 反馈数据)
+_FEEDBACK_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+
+def _dump_line(record: Dict[str, Any]) -> bytes:
+    """将一条反馈序列化为JSON Lines中的一行（含换行符）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+
+
+@contextlib.contextmanager
+def _file_lock(path: str):
+    """
+    对path旁的.lock文件加排他锁，使多个Streamlit会话/进程对同一反馈文件的写入串行化
+    POSIX使用fcntl.flock，Windows使用msvcrt.locking，两者都不可用时不加锁
+    """
+    with open(path + ".lock", 'a+b') as lock:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# 用户引导内容：静态数据，模块级共享
+_GUIDES: Final[Dict[str, Dict[str, Any]]] = {
+    "数据上传": {
+        "title": "📁 数据上传指南",
+        "steps": [
+            "选择支持的文件格式（CSV、Excel、JSON、Parquet）",
+            "确保数据格式整洁，编码为UTF-8",
+            "避免特殊字符在列名中",
+            "建议文件大小不超过100MB"
+        ],
+        "tips": [
+            "💡 首次使用建议上传小型数据集进行测试",
+            "💡 检查数据是否包含表头",
+            "💡 确保数值列格式正确"
         ]
-        
-        for tip in tips:
-            st.sidebar.info(tip)
+    },
+    "数据清洗": {
+        "title": "🧹 数据清洗指南",
+        "steps": [
+            "检查并处理缺失值",
+            "删除重复行",
+            "处理异常值",
+            "标准化数据格式"
+        ],
+        "tips": [
+            "💡 缺失值处理前先分析缺失模式",
+            "💡 异常值处理要结合业务背景",
+            "💡 保留原始数据备份"
+        ]
+    },
+    "可视化": {
+        "title": "📈 可视化指南",
+        "steps": [
+            "选择合适的图表类型",
+            "设置合适的颜色方案",
+            "添加标题和标签",
+            "优化图表布局"
+        ],
+        "tips": [
+            "💡 柱状图适合分类数据比较",
+            "💡 散点图适合相关性分析",
+            "💡 时间序列图适合趋势分析"
+        ]
+    },
+    "机器学习": {
+        "title": "🤖 机器学习指南",
+        "steps": [
+            "选择合适的问题类型（分类/回归/聚类）",
+            "准备特征和目标变量",
+            "选择合适的算法",
+            "评估模型性能"
+        ],
+        "tips": [
+            "💡 分类问题需要分类型目标变量",
+            "💡 回归问题需要数值型目标变量",
+            "💡 特征工程能显著提升模型性能"
+        ]
+    }
+}
 
-class FeedbackSystem:
-    """用户反馈系统"""
-    
-    def __init__(self, feedback_file: str = "feedback.json"):
-        self.feedback_file = feedback_file
-        self.feedback_data = self._load_feedback()
-    
-    def _load_feedback(self) -> Dict[str, Any]:
-        """加载反馈数据"""
-        if os.path.exists(self.feedback_file):
-            try:
-                with open(self.feedback_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {"feedbacks": [], "ratings": [], "suggestions": []}
-        return {"feedbacks": [], "ratings": [], "suggestions": []}
-    
-    def _save_feedback(self):
-        """保存反馈数据"""
-        with open(self.feedback_file, 'w', encoding='utf-8') as f:
-            json.dump(self.feedback_data, f, ensure_ascii=False, indent=2)
-    
-    def collect_feedback(self):
-        """收集用户反馈"""
-        st.markdown("## 📝 用户反馈")
-        
-        # 功能评分
-        st.markdown("### ⭐ 功能评分")
-        col1, col2, col3, col4, col5 = st.columns(5)
-        
-        ratings = {}
-        with col1:
-            ratings["数据上传"] = st.slider("数据上传", 1, 5, 3, key="rating_upload")
-        with col2:
-            ratings["数据清洗"] = st.slider("数据清洗", 1, 5, 3, key="rating_cleaning")
-        with col3:
-            ratings["可视化"] = st.slider("可视化", 1, 5, 3, key="rating_viz")
-        with col4:
-            ratings["机器学习"] = st.slider("机器学习", 1, 5, 3, key="rating_ml")
-        with col5:
-            ratings["AI助手"] = st.slider("AI助手", 1, 5, 3, key="rating_ai")
-        
-        # 总体评分
-        overall_rating = st.slider("总体评分", 1, 5, 3, key="rating_overall")
-        
-        # 反馈内容
-        feedback_text = st.text_area(
-            "请分享您的使用体验和建议：",
-            placeholder="您的反馈对我们很重要！请告诉我们您的使用体验、遇到的问题或改进建议...",
-            height=150
-        )
-        
-        # 联系方式（可选）
-        contact_info = st.text_input(
-            "联系方式（可选）：",
-            placeholder="邮箱或微信号，用于后续沟通"
-        )
-        
-        if st.button("📤 提交反馈", type="primary"):
-            if feedback_text.strip():
-                feedback = {
-                    "timestamp": datetime.now().isoformat(),
-                    "ratings": ratings,
-                    "overall_rating": overall_rating,
-                    "feedback": feedback_text,
-                    "contact": contact_info
-                }
-                
-                self.feedback_data["feedbacks"].append(feedback)
-                self._save_feedback()
-                
-                st.success("✅ 感谢您的反馈！我们会认真考虑您的建议。")
-                
-                # 显示反馈统计
-                self.show_feedback_stats()
-            else:
-                st.warning("请填写反馈内容")
-    
-    def show_feedback_stats(self):
-        """显示反馈统计"""
-        if not self.feedback_data["feedbacks"]:
-            return
-        
-        st.markdown("### 📊 反馈统计")
-        
-        # 计算平均评分
-        overall_ratings = [f["overall_rating"] for f in self.feedback_data["feedbacks"]]
-        avg_rating = sum(overall_ratings) / len(overall_ratings)
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("总反馈数", len(self.feedback_data["feedbacks"]))
-        with col2:
-            st.metric("平均评分", f"{avg_rating:.1f}/5")
-        with col3:
-            st.metric("最新反馈", datetime.fromisoformat(
-                self.feedback_data["feedbacks"][-1]["timestamp"]
-            ).strftime("%m-%d"))
 
-class HelpSystem:
-    """帮助系统"""
-    
-    def __init__(self):
-        self.help_topics = {
-            "快速开始": {
-                "content": """
+# 帮助主题内容：静态数据，模块级共享
+_HELP_TOPICS: Final[Dict[str, Dict[str, str]]] = {
+    "快速开始": {
+        "content": """
                 ## 🚀 快速开始指南
                 
                 ### 1. 上传数据
@@ -230,10 +161,10 @@ class HelpSystem:
                 - 应用机器学习算法进行建模分析
                 - 生成专业分析报告
                 """,
-                "icon": "🚀"
-            },
-            "功能说明": {
-                "content": """
+        "icon": "🚀"
+    },
+    "功能说明": {
+        "content": """
                 ## 📋 功能说明
                 
                 ### 📁 数据上传
@@ -264,10 +195,10 @@ class HelpSystem:
                 - 专业报告生成
                 - AI智能建议
                 """,
-                "icon": "📋"
-            },
-            "常见问题": {
-                "content": """
+        "icon": "📋"
+    },
+    "常见问题": {
+        "content": """
                 ## ❓ 常见问题
                 
                 ### Q: 支持哪些数据格式？
@@ -285,10 +216,10 @@ class HelpSystem:
                 ### Q: 如何导出分析结果？
                 A: 在报告生成页面可以选择多种格式导出，包括PDF、HTML、Markdown等。
                 """,
-                "icon": "❓"
-            },
-            "高级技巧": {
-                "content": """
+        "icon": "❓"
+    },
+    "高级技巧": {
+        "content": """
                 ## 🎯 高级技巧
                 
                 ### 数据预处理技巧
@@ -311,10 +242,254 @@ class HelpSystem:
                 - 合理使用缓存功能
                 - 定期清理内存
                 """,
-                "icon": "🎯"
-            }
+        "icon": "🎯"
+    }
+}
+
+
+# 上下文帮助提示
+_CONTEXT_HELP: Final[Dict[str, str]] = {
+    "数据上传": "💡 提示：确保数据格式整洁，检查编码格式，避免特殊字符在列名中",
+    "数据清洗": "💡 提示：先分析数据质量，选择合适的清洗策略，保留原始数据备份",
+    "可视化": "💡 提示：根据数据类型选择合适的图表，注意颜色搭配和标签设置",
+    "机器学习": "💡 提示：选择合适的算法，注意特征工程，使用交叉验证评估模型"
+}
+
+
+def _compose_guide(guide: Dict[str, Any]) -> str:
+    """将一条引导拼接为一段Markdown文本"""
+    parts = [f"## {guide['title']}", "### 📋 操作步骤"]
+    parts.extend(f"{i}. {step}" for i, step in enumerate(guide['steps'], 1))
+    parts.append("### 💡 实用技巧")
+    parts.extend(guide['tips'])
+    return "\n\n".join(parts)
+
+
+# 引导与帮助内容在导入时一次性拼好Markdown，渲染时直接输出
+_GUIDES_MD: Final[Dict[str, str]] = {key: _compose_guide(guide) for key, guide in _GUIDES.items()}
+
+_HELP_MD: Final[Dict[str, str]] = {
+    topic: f"### {help_content['icon']} {topic}\n\n{textwrap.dedent(help_content['content'])}"
+    for topic, help_content in _HELP_TOPICS.items()
+}
+
+_QUICK_TIPS_MD: Final[str] = "\n".join(f"- {tip}" for tip in (
+    "🎯 使用AI助手获取专业建议",
+    "📊 尝试不同的可视化类型",
+    "🔍 利用数据洞察功能深入分析",
+    "⚡ 大数据集可使用性能优化功能"
+))
+
+class UserGuide:
+    """用户引导系统"""
+    
+    def __init__(self):
+        self.guides = _GUIDES
+    
+    def show_guide(self, guide_key: str):
+        """显示用户引导"""
+        if guide_key not in self.guides:
+            st.warning("未找到对应的引导信息")
+            return
+        
+        st.markdown(_GUIDES_MD[guide_key])
+    
+    def show_quick_tips(self):
+        """显示快速提示"""
+        st.sidebar.markdown("### 💡 快速提示")
+        # 合并为一个提示框，避免每条提示各占一个元素
+        st.sidebar.info(_QUICK_TIPS_MD)
+
+class FeedbackSystem:
+    """用户反馈系统"""
+    
+    def __init__(self, feedback_file: str = "feedback.jsonl"):
+        # 反馈按JSON Lines逐条追加保存；旧版整体保存的同名.json文件在首次加载时导入
+        self.feedback_file = feedback_file
+        self.legacy_file = os.path.splitext(feedback_file)[0] + ".json"
+        # 实例由所有会话线程共享，修改feedback_data与汇总时需持有此锁
+        self._lock = threading.Lock()
+        self._migrate_legacy_feedback()
+        self.feedback_data = self._load_feedback()
+        # 总体评分的增量汇总，渲染统计时无需遍历全部反馈
+        self._agg = self._compute_aggregates()
+    
+    def _compute_aggregates(self) -> Dict[str, Any]:
+        """扫描一次全部反馈，得到总体评分之和、数量与最新反馈日期（已格式化为%m-%d）"""
+        feedbacks = self.feedback_data["feedbacks"]
+        return {
+            "sum": float(sum(f["overall_rating"] for f in feedbacks)),
+            "count": len(feedbacks),
+            "last_mmdd": datetime.fromisoformat(feedbacks[-1]["timestamp"]).strftime("%m-%d") if feedbacks else None
         }
     
+    def _load_feedback(self) -> Dict[str, Any]:
+        """加载反馈数据，文件未修改时直接复用上次解析的结果"""
+        path = os.path.abspath(self.feedback_file)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        cached = _FEEDBACK_CACHE.get(path)
+        if mtime is not None and cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        data = {"feedbacks": [], "ratings": [], "suggestions": []}
+        if mtime is None:
+            return data
+        
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        feedbacks = data["feedbacks"]
+        try:
+            with open(path, 'rb') as f:
+                # 以已打开文件的修改时间作为缓存标记，与实际读到的内容一致
+                mtime = os.fstat(f.fileno()).st_mtime_ns
+                for line in f:
+                    if line.strip():
+                        feedbacks.append(loads(line))
+        except FileNotFoundError:
+            # stat之后文件被删除
+            return data
+        except (OSError, ValueError):
+            # orjson.JSONDecodeError与json.JSONDecodeError均为ValueError的子类
+            logger.warning(f"反馈文件损坏或无法读取，以空数据启动: {path}", exc_info=True)
+            return {"feedbacks": [], "ratings": [], "suggestions": []}
+        
+        _FEEDBACK_CACHE[path] = (mtime, data)
+        return data
+    
+    def _migrate_legacy_feedback(self):
+        """JSON Lines文件尚不存在而旧版反馈文件存在时，将其中的反馈逐条写入新文件（旧文件保留不动）"""
+        path = os.path.abspath(self.feedback_file)
+        legacy = os.path.abspath(self.legacy_file)
+        if legacy == path or os.path.exists(path) or not os.path.exists(legacy):
+            return
+        
+        with _file_lock(path):
+            # 加锁后再次检查：其他会话可能已完成导入
+            if os.path.exists(path):
+                return
+            try:
+                with open(legacy, 'rb') as f:
+                    raw = f.read()
+                feedbacks = (orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw))["feedbacks"]
+            except (OSError, ValueError, TypeError, KeyError):
+                logger.warning("旧版反馈文件损坏或无法读取，未导入: %s", legacy, exc_info=True)
+                return
+            
+            # 先写临时文件再整体替换，导入中途失败不会留下不完整的反馈文件
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.writelines(_dump_line(record) for record in feedbacks)
+            os.replace(tmp_path, path)
+            logger.info("已从旧版反馈文件导入 %d 条反馈: %s", len(feedbacks), legacy)
+    
+    def _save_feedback(self, record: Dict[str, Any]):
+        """保存一条反馈：立即逐行追加到文件末尾，并同步更新内存数据、汇总与解析缓存；文件被其他会话改写过时整体重新加载"""
+        line = _dump_line(record)
+        path = os.path.abspath(self.feedback_file)
+        with self._lock, _file_lock(path):
+            # 加锁后检查本实例的数据是否仍与文件一致（缓存项即本实例数据且文件未被其他会话改写过）
+            # 不一致时本地数据已不完整，写入后从文件重新加载
+            cached = _FEEDBACK_CACHE.get(path)
+            try:
+                stale = (cached is None or cached[1] is not self.feedback_data
+                         or os.stat(path).st_mtime_ns != cached[0])
+            except FileNotFoundError:
+                stale = False
+            with open(path, 'ab') as f:
+                f.write(line)
+            
+            if stale:
+                # 重新读取的数据已包含本条反馈
+                _FEEDBACK_CACHE.pop(path, None)
+                self.feedback_data = self._load_feedback()
+                self._agg = self._compute_aggregates()
+                return
+            
+            mtime = os.stat(path).st_mtime_ns
+            self.feedback_data["feedbacks"].append(record)
+            self._agg["sum"] += record["overall_rating"]
+            self._agg["count"] += 1
+            self._agg["last_mmdd"] = datetime.fromisoformat(record["timestamp"]).strftime("%m-%d")
+            _FEEDBACK_CACHE[path] = (mtime, self.feedback_data)
+    
+    def collect_feedback(self):
+        """收集用户反馈"""
+        st.markdown("## 📝 用户反馈")
+        
+        # 功能评分
+        st.markdown("### ⭐ 功能评分")
+        cols = st.columns(len(_RATING_SPECS))
+        ratings = {
+            label: col.slider(label, 1, 5, 3, key=key)
+            for col, (label, key) in zip(cols, _RATING_SPECS)
+        }
+        
+        # 总体评分
+        overall_rating = st.slider("总体评分", 1, 5, 3, key="rating_overall")
+        
+        # 反馈内容
+        feedback_text = st.text_area(
+            "请分享您的使用体验和建议：",
+            placeholder="您的反馈对我们很重要！请告诉我们您的使用体验、遇到的问题或改进建议...",
+            height=150
+        )
+        
+        # 联系方式（可选）
+        contact_info = st.text_input(
+            "联系方式（可选）：",
+            placeholder="邮箱或微信号，用于后续沟通"
+        )
+        
+        if st.button("📤 提交反馈", type="primary"):
+            if feedback_text.strip():
+                feedback = {
+                    "timestamp": datetime.now().isoformat(),
+                    "ratings": ratings,
+                    "overall_rating": overall_rating,
+                    "feedback": feedback_text,
+                    "contact": contact_info
+                }
+                
+                self._save_feedback(feedback)
+                
+                st.success("✅ 感谢您的反馈！我们会认真考虑您的建议。")
+                
+                # 显示反馈统计
+                self.show_feedback_stats()
+            else:
+                st.warning("请填写反馈内容")
+    
+    def show_feedback_stats(self):
+        """显示反馈统计"""
+        # 反馈数据被其他实例追加过时重新汇总一次
+        if self._agg["count"] != len(self.feedback_data["feedbacks"]):
+            self._agg = self._compute_aggregates()
+        agg = self._agg
+        if not agg["count"]:
+            return
+        
+        st.markdown("### 📊 反馈统计")
+        
+        # 平均评分
+        avg_rating = agg["sum"] / agg["count"]
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("总反馈数", agg["count"])
+        with col2:
+            st.metric("平均评分", f"{avg_rating:.1f}/5")
+        with col3:
+            st.metric("最新反馈", agg["last_mmdd"])
+
+class HelpSystem:
+    """帮助系统"""
+    
+    def __init__(self):
+        self.help_topics = _HELP_TOPICS
+    
     def show_help_page(self):
         """显示帮助页面"""
         st.markdown("## 📚 帮助中心")
@@ -326,89 +501,113 @@ class HelpSystem:
         )
         
         if topic in self.help_topics:
-            help_content = self.help_topics[topic]
-            st.markdown(f"### {help_content['icon']} {topic}")
-            st.markdown(help_content['content'])
+            st.markdown(_HELP_MD[topic])
     
     def show_context_help(self, context: str):
         """显示上下文帮助"""
-        context_help = {
-            "数据上传": "💡 提示：确保数据格式整洁，检查编码格式，避免特殊字符在列名中",
-            "数据清洗": "💡 提示：先分析数据质量，选择合适的清洗策略，保留原始数据备份",
-            "可视化": "💡 提示：根据数据类型选择合适的图表，注意颜色搭配和标签设置",
-            "机器学习": "💡 提示：选择合适的算法，注意特征工程，使用交叉验证评估模型"
-        }
-        
-        if context in context_help:
-            st.info(context_help[context])
+        message = _CONTEXT_HELP.get(context)
+        if message:
+            st.info(message)
+
+@dataclass(slots=True)
+class TaskProgress:
+    """单个任务的进度状态：各步骤完成时刻（相对开始时间的秒数）存于预分配的float64数组"""
+    total: int
+    # 预先计算倒数，更新进度时用乘法代替除法
+    inv_total: float
+    start_time: float
+    step_ts: np.ndarray
+    current: int = 0
+    # 只保留最近一步的名称与说明，长任务不会累积步骤记录
+    step_name: Optional[str] = None
+    step_description: str = ""
 
 class ProgressTracker:
     """进度跟踪器"""
     
     def __init__(self):
-        self.progress_data = {}
+        self.progress_data: Dict[str, TaskProgress] = {}
     
     def start_progress(self, task_name: str, total_steps: int):
-        """开始进度跟踪"""
-        self.progress_data[task_name] = {
-            "total": total_steps,
-            "current": 0,
-            "start_time": time.time(),
-            "steps": []
-        }
+        """开始进度跟踪（计时使用单调时钟，不受系统时间调整影响）"""
+        self.progress_data[task_name] = TaskProgress(
+            total=total_steps,
+            inv_total=1.0 / total_steps if total_steps else 0.0,
+            start_time=time.monotonic(),
+            step_ts=np.empty(max(total_steps, 0), dtype='f8')
+        )
     
     def update_progress(self, task_name: str, step_name: str, step_description: str = ""):
         """更新进度"""
-        if task_name in self.progress_data:
-            self.progress_data[task_name]["current"] += 1
-            self.progress_data[task_name]["steps"].append({
-                "name": step_name,
-                "description": step_description,
-                "timestamp": time.time()
-            })
+        progress = self.progress_data.get(task_name)
+        if progress is None:
+            return
+        
+        # 超出预计步数的更新只计数，不再记录完成时刻
+        if progress.current < progress.total:
+            progress.step_ts[progress.current] = time.monotonic() - progress.start_time
+        progress.current += 1
+        progress.step_name = step_name
+        progress.step_description = step_description
     
     def show_progress(self, task_name: str):
-        """显示进度"""
-        if task_name not in self.progress_data:
+        """显示进度：进度条与说明文字在本次运行中创建，会话状态里只保存数值与文字"""
+        progress = self.progress_data.get(task_name)
+        if progress is None:
             return
         
-        progress = self.progress_data[task_name]
-        current = progress["current"]
-        total = progress["total"]
+        current = progress.current
+        total = progress.total
         
         # 进度条
-        progress_percent = current / total
+        progress_percent = current * progress.inv_total
         st.progress(progress_percent)
-        st.write(f"**进度**: {current}/{total} ({progress_percent:.1%})")
+        lines = [f"**进度**: {current}/{total} ({progress_percent:.1%})"]
         
         # 当前步骤
-        if progress["steps"]:
-            current_step = progress["steps"][-1]
-            st.info(f"🔄 当前步骤: {current_step['name']}")
-            if current_step['description']:
-                st.write(f"*{current_step['description']}*")
+        if progress.step_name is not None:
+            lines.append(f"🔄 当前步骤: **{progress.step_name}**")
+            if progress.step_description:
+                lines.append(f"*{progress.step_description}*")
         
-        # 预计剩余时间
-        if current > 0:
-            elapsed_time = time.time() - progress["start_time"]
-            avg_time_per_step = elapsed_time / current
+        # 预计剩余时间：已记录的最后完成时刻除以步数即为平均每步耗时
+        recorded = min(current, total)
+        if recorded > 0:
+            avg_time_per_step = progress.step_ts[recorded - 1] / recorded
             remaining_steps = total - current
             estimated_remaining = avg_time_per_step * remaining_steps
             
-            st.write(f"⏱️ 预计剩余时间: {estimated_remaining:.1f}秒")
+            lines.append(f"⏱️ 预计剩余时间: {estimated_remaining:.1f}秒")
+        
+        # 文字信息合并为一个元素输出
+        st.markdown("  \n".join(lines))
     
     def complete_progress(self, task_name: str):
         """完成进度跟踪"""
-        if task_name in self.progress_data:
-            total_time = time.time() - self.progress_data[task_name]["start_time"]
+        progress = self.progress_data.pop(task_name, None)
+        if progress is not None:
+            total_time = time.monotonic() - progress.start_time
             st.success(f"✅ 任务完成！总耗时: {total_time:.1f}秒")
-            del self.progress_data[task_name]
 
 class NotificationSystem:
     """通知系统"""
     
     def __init__(self):
-        self.notifications = []
+        # 按过期时间排序的最小堆：(过期时间, 通知ID)
+        self._heap: List[Tuple[float, int]] = []
+        # 未过期的通知，按添加顺序保存：通知ID -> 通知
+        self._items: Dict[int, Dict[str, Any]] = {}
+        self._next_id = itertools.count()
+        self._renderers = {
+            "success": st.success,
+            "warning": st.warning,
+            "error": st.error
+        }
+    
+    @property
+    def notifications(self) -> List[Dict[str, Any]]:
+        """当前保存的通知列表"""
+        return list(self._items.values())
     
     def add_notification(self, message: str, level: str = "info", duration: int = 5):
         """添加通知"""
@@ -418,35 +617,69 @@ class NotificationSystem:
             "timestamp": time.time(),
             "duration": duration
         }
-        self.notifications.append(notification)
+        notification_id = next(self._next_id)
+        self._items[notification_id] = notification
+        heapq.heappush(self._heap, (notification["timestamp"] + duration, notification_id))
     
     def show_notifications(self):
         """显示通知"""
         current_time = time.time()
         
-        # 过滤过期通知
-        self.notifications = [
-            n for n in self.notifications 
-            if current_time - n["timestamp"] < n["duration"]
-        ]
+        # 只弹出已过期的通知，无过期时不重建任何容器
+        heap = self._heap
+        while heap and heap[0][0] <= current_time:
+            _, notification_id = heapq.heappop(heap)
+            del self._items[notification_id]
         
         # 显示当前通知
-        for notification in self.notifications:
-            if notification["level"] == "success":
-                st.success(notification["message"])
-            elif notification["level"] == "warning":
-                st.warning(notification["message"])
-            elif notification["level"] == "error":
-                st.error(notification["message"])
-            else:
-                st.info(notification["message"])
+        renderers = self._renderers
+        for notification in self._items.values():
+            renderers.get(notification["level"], st.info)(notification["message"])
+
+# 全局实例：首次使用时才创建，避免导入模块时读取反馈文件
+# 引导、反馈与帮助由st.cache_resource托管，整个进程内所有会话共享同一实例，模块重新加载后也不会重复创建
+@st.cache_resource(show_spinner=False)
+def get_user_guide() -> UserGuide:
+    """获取用户引导实例"""
+    return UserGuide()
+
+@st.cache_resource(show_spinner=False)
+def get_feedback_system() -> FeedbackSystem:
+    """获取用户反馈系统实例"""
+    return FeedbackSystem()
+
+@st.cache_resource(show_spinner=False)
+def get_help_system() -> HelpSystem:
+    """获取帮助系统实例"""
+    return HelpSystem()
+
+# 进度与通知属于各自会话，保存在st.session_state中，不在会话之间共享
+def get_progress_tracker() -> ProgressTracker:
+    """获取当前会话的进度跟踪器实例"""
+    if '_progress_tracker' not in st.session_state:
+        st.session_state['_progress_tracker'] = ProgressTracker()
+    return st.session_state['_progress_tracker']
+
+def get_notification_system() -> NotificationSystem:
+    """获取当前会话的通知系统实例"""
+    if '_notification_system' not in st.session_state:
+        st.session_state['_notification_system'] = NotificationSystem()
+    return st.session_state['_notification_system']
+
+_LAZY_INSTANCES = {
+    "user_guide": get_user_guide,
+    "feedback_system": get_feedback_system,
+    "help_system": get_help_system,
+    "progress_tracker": get_progress_tracker,
+    "notification_system": get_notification_system
+}
 
-# 全局实例
-user_guide = UserGuide()
-feedback_system = FeedbackSystem()
-help_system = HelpSystem()
-progress_tracker = ProgressTracker()
-notification_system = NotificationSystem()
+def __getattr__(name: str):
+    """兼容原有的模块级实例名，访问时才创建实例"""
+    getter = _LAZY_INSTANCES.get(name)
+    if getter is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getter()
 
 def render_user_experience_components():
     """渲染用户体验组件"""
@@ -455,7 +688,7 @@ def render_user_experience_components():
     
     # 快速帮助
     if st.sidebar.button("❓ 快速帮助"):
-        help_system.show_context_help("数据上传")
+        get_help_system().show_context_help("数据上传")
     
     # 用户引导
     guide_option = st.sidebar.selectbox(
@@ -464,15 +697,15 @@ def render_user_experience_components():
     )
     
     if guide_option != "选择引导":
-        user_guide.show_guide(guide_option)
+        get_user_guide().show_guide(guide_option)
     
     # 反馈系统
     if st.sidebar.button("📝 用户反馈"):
-        feedback_system.collect_feedback()
+        get_feedback_system().collect_feedback()
     
     # 帮助中心
     if st.sidebar.button("📚 帮助中心"):
-        help_system.show_help_page()
+        get_help_system().show_help_page()
     
     # 显示快速提示
-    user_guide.show_quick_tips()
+    get_user_guide().show_quick_tips()
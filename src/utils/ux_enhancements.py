@@ -10,19 +10,12 @@ import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
 import time
 import json
+import itertools
+from collections import Counter, deque
+from src.utils.visualization_helpers import create_data_type_chart
 
-
-class UXEnhancements:
-    """用户体验增强类"""
-    
-    def __init__(self):
-        """初始化用户体验增强"""
-        self.setup_custom_css()
-        self.setup_session_state()
-    
-    def setup_custom_css(self):
-        """设置自定义CSS样式"""
-        st.markdown("""
+# 用户体验组件共用的样式表
+UX_CSS = """
         <style>
         /* 现代化卡片样式 */
         .modern-card {
@@ -103,27 +96,25 @@ class UXEnhancements:
             }
         }
         </style>
-        """, unsafe_allow_html=True)
-    
-    def setup_session_state(self):
-        """设置会话状态"""
-        if 'user_preferences' not in st.session_state:
-            st.session_state.user_preferences = {
-                'theme': 'light',
-                'language': 'zh',
-                'auto_save': True,
-                'notifications': True
-            }
-        
-        if 'workflow_history' not in st.session_state:
-            st.session_state.workflow_history = []
-        
-        if 'favorites' not in st.session_state:
-            st.session_state.favorites = []
-    
-    def render_welcome_screen(self):
-        """渲染欢迎屏幕"""
-        st.markdown("""
+"""
+
+# 通知消息的图标与背景色
+_NOTIFICATION_ICONS = {
+    "success": "✅",
+    "warning": "⚠️",
+    "error": "❌",
+    "info": "ℹ️"
+}
+
+_NOTIFICATION_COLORS = {
+    "success": "#00ff88",
+    "warning": "#ffaa00",
+    "error": "#ff4444",
+    "info": "#0088ff"
+}
+
+# 欢迎屏幕
+_WELCOME_HTML = """
         <div class="modern-card fade-in">
             <h1 style="text-align: center; color: white; margin-bottom: 20px;">
                 👁️ 欢迎使用数眸数据分析平台
@@ -146,35 +137,10 @@ class UXEnhancements:
                 </div>
             </div>
         </div>
-        """, unsafe_allow_html=True)
-    
-    def render_quick_actions(self):
-        """渲染快速操作面板"""
-        st.sidebar.markdown("### ⚡ 快速操作")
-        
-        col1, col2 = st.sidebar.columns(2)
-        
-        with col1:
-            if st.button("📁 上传数据", use_container_width=True):
-                st.session_state.current_page = "📁 数据上传"
-                st.rerun()
-        
-        with col2:
-            if st.button("🔍 快速分析", use_container_width=True):
-                st.session_state.current_page = "🔍 自动数据分析"
-                st.rerun()
-        
-        st.sidebar.markdown("### 📋 最近操作")
-        if st.session_state.workflow_history:
-            for i, action in enumerate(st.session_state.workflow_history[-5:]):
-                st.sidebar.text(f"{i+1}. {action}")
-        else:
-            st.sidebar.text("暂无操作记录")
-    
-    def render_data_status_card(self, data: Optional[pd.DataFrame] = None):
-        """渲染数据状态卡片"""
-        if data is None:
-            st.markdown("""
+        """
+
+# 数据状态卡片：未加载数据
+_STATUS_EMPTY_HTML = """
             <div class="modern-card">
                 <h3 style="color: white; margin-bottom: 15px;">📊 数据状态</h3>
                 <div style="display: flex; align-items: center; margin-bottom: 10px;">
@@ -183,15 +149,10 @@ class UXEnhancements:
                 </div>
                 <p style="color: white; opacity: 0.8;">请先上传数据文件开始分析</p>
             </div>
-            """, unsafe_allow_html=True)
-        else:
-            # 计算数据质量指标
-            missing_ratio = data.isnull().sum().sum() / (len(data) * len(data.columns))
-            duplicate_ratio = data.duplicated().sum() / len(data)
-            
-            quality_score = max(0, 100 - missing_ratio * 50 - duplicate_ratio * 30)
-            
-            st.markdown(f"""
+            """
+
+# 数据状态卡片：已加载数据，占位符在渲染时填入
+_STATUS_TPL = """
             <div class="modern-card">
                 <h3 style="color: white; margin-bottom: 15px;">📊 数据状态</h3>
                 <div style="display: flex; align-items: center; margin-bottom: 10px;">
@@ -199,25 +160,22 @@ class UXEnhancements:
                     <span style="color: white;">数据已加载</span>
                 </div>
                 <div style="color: white; margin-bottom: 10px;">
-                    <strong>数据集:</strong> {len(data)} 行 × {len(data.columns)} 列
+                    <strong>数据集:</strong> {rows} 行 × {columns} 列
                 </div>
                 <div style="color: white; margin-bottom: 10px;">
                     <strong>质量评分:</strong> {quality_score:.0f}/100
                 </div>
                 <div style="color: white; margin-bottom: 10px;">
-                    <strong>缺失值:</strong> {data.isnull().sum().sum()} ({missing_ratio:.1%})
+                    <strong>缺失值:</strong> {missing_count} ({missing_ratio:.1%})
                 </div>
                 <div style="color: white;">
-                    <strong>重复行:</strong> {data.duplicated().sum()} ({duplicate_ratio:.1%})
+                    <strong>重复行:</strong> {duplicate_count} ({duplicate_ratio:.1%})
                 </div>
             </div>
-            """, unsafe_allow_html=True)
-    
-    def render_progress_tracker(self, current_step: int, total_steps: int, step_name: str):
-        """渲染进度跟踪器"""
-        progress = current_step / total_steps
-        
-        st.markdown(f"""
+            """
+
+# 进度跟踪器
+_PROGRESS_TRACKER_TPL = """
         <div class="progress-container">
             <h4 style="margin-bottom: 10px;">🔄 分析进度</h4>
             <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
@@ -229,27 +187,12 @@ class UXEnhancements:
             </div>
             <p style="margin-top: 10px; font-weight: bold;">{step_name}</p>
         </div>
-        """, unsafe_allow_html=True)
-    
-    def render_notification(self, message: str, notification_type: str = "info"):
-        """渲染通知消息"""
-        icon_map = {
-            "success": "✅",
-            "warning": "⚠️",
-            "error": "❌",
-            "info": "ℹ️"
-        }
-        
-        color_map = {
-            "success": "#00ff88",
-            "warning": "#ffaa00",
-            "error": "#ff4444",
-            "info": "#0088ff"
-        }
-        
-        st.markdown(f"""
+        """
+
+# 通知消息
+_NOTIFICATION_TPL = """
         <div style="
-            background: {color_map[notification_type]};
+            background: {color};
             color: white;
             padding: 15px;
             border-radius: 10px;
@@ -258,10 +201,200 @@ class UXEnhancements:
             align-items: center;
             animation: fadeIn 0.3s ease-in-out;
         ">
-            <span style="font-size: 20px; margin-right: 10px;">{icon_map[notification_type]}</span>
+            <span style="font-size: 20px; margin-right: 10px;">{icon}</span>
             <span>{message}</span>
         </div>
-        """, unsafe_allow_html=True)
+        """
+
+# 按通知类型预先填入图标与背景色，渲染时只需填入消息文本
+_NOTIFICATION_TPLS = {
+    notification_type: _NOTIFICATION_TPL.format(
+        color=_NOTIFICATION_COLORS[notification_type],
+        icon=icon,
+        message="{message}"
+    )
+    for notification_type, icon in _NOTIFICATION_ICONS.items()
+}
+
+# 分析建议卡片：优先级 -> (背景色, 左边框颜色)
+_SUGGESTION_STYLES = {
+    "🔥 高": ("#ffebee", "#f44336"),
+    "📊 推荐": ("#e8f5e8", "#4caf50"),
+    "🤖 推荐": ("#e8f5e8", "#4caf50")
+}
+_SUGGESTION_DEFAULT_STYLE = ("#fff3e0", "#ff9800")
+
+_SUGGESTION_TPL = """
+                <div style="
+                    background: {background};
+                    border-left: 4px solid {border};
+                    padding: 15px;
+                    margin: 10px 0;
+                    border-radius: 5px;
+                ">
+                    <div style="font-weight: bold; margin-bottom: 5px;">
+                        {priority} {title}
+                    </div>
+                    <div style="color: #666;">
+                        {description}
+                    </div>
+                </div>
+                """
+
+# 操作历史最多保留的条数
+_HISTORY_LIMIT = 50
+
+# 数值型列的dtype.kind
+_NUMERIC_KINDS = np.array(list("iufc"))
+
+def _count_duplicates(data: pd.DataFrame) -> int:
+    """
+    统计重复行：先按整行哈希筛出哈希值出现多次的候选行，只对候选行做精确的duplicated判断
+    相同的行哈希值必然相同，因此结果与data.duplicated().sum()一致；重复行很少时绝大部分行在哈希阶段即被排除
+    """
+    if data.empty:
+        return int(data.duplicated().sum())
+    
+    # -0.0与0.0相等但哈希值不同，浮点列先加0.0统一
+    hashed = data
+    floats = [i for i, dtype in enumerate(data.dtypes) if dtype.kind == 'f']
+    if floats:
+        hashed = data.copy(deep=False)
+        for i in floats:
+            hashed.isetitem(i, hashed.iloc[:, i] + 0.0)
+    
+    candidates = pd.util.hash_pandas_object(hashed, index=False).duplicated(keep=False).to_numpy()
+    if not candidates.any():
+        return 0
+    return int(data[candidates].duplicated().sum())
+
+
+@st.fragment
+def _feedback_form():
+    """反馈表单：切换类型、输入内容或提交时只重跑表单本身，不触发整页重跑"""
+    st.markdown("### 💬 反馈")
+    
+    feedback_type = st.selectbox(
+        "反馈类型",
+        ["功能建议", "问题报告", "使用体验", "其他"]
+    )
+    
+    feedback_text = st.text_area(
+        "您的反馈",
+        placeholder="请详细描述您的建议或遇到的问题...",
+        height=100
+    )
+    
+    if st.button("提交反馈"):
+        if feedback_text.strip():
+            # 这里可以添加反馈保存逻辑
+            st.success("感谢您的反馈！")
+        else:
+            st.warning("请输入反馈内容")
+
+
+class UXEnhancements:
+    """用户体验增强类"""
+    
+    def __init__(self):
+        """初始化用户体验增强（实例由st.cache_resource缓存，这里不能输出页面元素）"""
+        self.setup_session_state()
+    
+    def setup_custom_css(self):
+        """
+        设置自定义CSS样式，样式表为模块级常量，通过st.html直接输出、不经过Markdown解析
+        与ui_components._inject_css相同，需由用到这些样式的渲染方法在每次运行时调用
+        """
+        st.html(UX_CSS)
+    
+    def setup_session_state(self):
+        """设置会话状态"""
+        if 'user_preferences' not in st.session_state:
+            st.session_state.user_preferences = {
+                'theme': 'light',
+                'language': 'zh',
+                'auto_save': True,
+                'notifications': True
+            }
+        
+        # 操作历史为定长队列，超出上限时自动丢弃最早的记录
+        history = st.session_state.get('workflow_history')
+        if not isinstance(history, deque):
+            st.session_state.workflow_history = deque(history or (), maxlen=_HISTORY_LIMIT)
+        
+        if 'favorites' not in st.session_state:
+            st.session_state.favorites = []
+    
+    def render_welcome_screen(self):
+        """渲染欢迎屏幕"""
+        self.setup_custom_css()
+        st.markdown(_WELCOME_HTML, unsafe_allow_html=True)
+    
+    def render_quick_actions(self):
+        """渲染快速操作面板"""
+        st.sidebar.markdown("### ⚡ 快速操作")
+        
+        col1, col2 = st.sidebar.columns(2)
+        
+        with col1:
+            if st.button("📁 上传数据", use_container_width=True):
+                st.session_state.current_page = "📁 数据上传"
+                st.rerun()
+        
+        with col2:
+            if st.button("🔍 快速分析", use_container_width=True):
+                st.session_state.current_page = "🔍 自动数据分析"
+                st.rerun()
+        
+        st.sidebar.markdown("### 📋 最近操作")
+        history = st.session_state.workflow_history
+        if history:
+            # 操作内容可能含文件名等任意文本，用st.text原样显示，多行合并为一个元素
+            recent = itertools.islice(history, max(len(history) - 5, 0), None)
+            st.sidebar.text("\n".join(f"{i+1}. {action}" for i, action in enumerate(recent)))
+        else:
+            st.sidebar.text("暂无操作记录")
+    
+    def render_data_status_card(self, data: Optional[pd.DataFrame] = None):
+        """渲染数据状态卡片"""
+        self.setup_custom_css()
+        if data is None:
+            st.markdown(_STATUS_EMPTY_HTML, unsafe_allow_html=True)
+        else:
+            # 计算数据质量指标：缺失值与重复行各扫描一次
+            missing_count = int(data.isna().to_numpy().sum())
+            duplicate_count = _count_duplicates(data)
+            missing_ratio = missing_count / (len(data) * len(data.columns))
+            duplicate_ratio = duplicate_count / len(data)
+            
+            quality_score = max(0, 100 - missing_ratio * 50 - duplicate_ratio * 30)
+            
+            st.markdown(_STATUS_TPL.format(
+                rows=len(data),
+                columns=len(data.columns),
+                quality_score=quality_score,
+                missing_count=missing_count,
+                missing_ratio=missing_ratio,
+                duplicate_count=duplicate_count,
+                duplicate_ratio=duplicate_ratio
+            ), unsafe_allow_html=True)
+    
+    def render_progress_tracker(self, current_step: int, total_steps: int, step_name: str):
+        """渲染进度跟踪器"""
+        self.setup_custom_css()
+        progress = current_step / total_steps
+        
+        st.markdown(_PROGRESS_TRACKER_TPL.format(
+            current_step=current_step,
+            total_steps=total_steps,
+            progress=progress,
+            step_name=step_name
+        ), unsafe_allow_html=True)
+    
+    def render_notification(self, message: str, notification_type: str = "info"):
+        """渲染通知消息"""
+        self.setup_custom_css()
+        st.markdown(_NOTIFICATION_TPLS[notification_type].format(message=message), unsafe_allow_html=True)
     
     def render_tooltip(self, text: str, tooltip_text: str):
         """渲染带工具提示的文本"""
@@ -279,25 +412,9 @@ class UXEnhancements:
     
     def render_feedback_form(self):
         """渲染反馈表单"""
-        st.sidebar.markdown("### 💬 反馈")
-        
-        feedback_type = st.sidebar.selectbox(
-            "反馈类型",
-            ["功能建议", "问题报告", "使用体验", "其他"]
-        )
-        
-        feedback_text = st.sidebar.text_area(
-            "您的反馈",
-            placeholder="请详细描述您的建议或遇到的问题...",
-            height=100
-        )
-        
-        if st.sidebar.button("提交反馈"):
-            if feedback_text.strip():
-                # 这里可以添加反馈保存逻辑
-                st.sidebar.success("感谢您的反馈！")
-            else:
-                st.sidebar.warning("请输入反馈内容")
+        # 片段内不能调用st.sidebar，在侧边栏上下文中调用片段
+        with st.sidebar:
+            _feedback_form()
     
     def render_shortcuts_panel(self):
         """渲染快捷键面板"""
@@ -312,13 +429,21 @@ class UXEnhancements:
             ("Ctrl+S", "保存"),
         ]
         
-        for key, desc in shortcuts:
-            st.sidebar.text(f"**{key}** - {desc}")
+        # 一次输出全部快捷键，行尾两个空格为Markdown换行
+        st.sidebar.markdown("  \n".join(f"**{key}** - {desc}" for key, desc in shortcuts))
     
-    def render_data_preview_enhanced(self, data: pd.DataFrame, max_rows: int = 10):
-        """增强的数据预览"""
+    def render_data_preview_enhanced(self, data: pd.DataFrame, max_rows: int = 10,
+                                     missing_counts: Optional[pd.Series] = None):
+        """增强的数据预览，missing_counts为调用方已算好的各列缺失值数量，未提供时在此计算"""
         st.subheader("📋 数据预览")
         
+        # 数据类型统计只计算一次，概览指标、分布表与饼图共用
+        dtype_counts = data.dtypes.value_counts()
+        dtype_frame = pd.DataFrame({
+            "数据类型": dtype_counts.index.astype(str),
+            "列数": dtype_counts.to_numpy()
+        })
+        
         # 数据概览
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -328,24 +453,19 @@ class UXEnhancements:
         with col3:
             st.metric("内存使用", f"{data.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MB")
         with col4:
-            st.metric("数据类型", len(data.dtypes.unique()))
+            st.metric("数据类型", len(dtype_counts))
         
         # 数据类型分布
         st.write("**数据类型分布**")
-        dtype_counts = data.dtypes.value_counts()
         col1, col2 = st.columns(2)
         
         with col1:
-            st.dataframe(dtype_counts, use_container_width=True)
+            # 类型名已转为字符串，可直接转换为Arrow表
+            st.dataframe(dtype_frame, use_container_width=True, hide_index=True)
         
         with col2:
-            # 数据类型饼图
-            import plotly.express as px
-            fig = px.pie(
-                values=dtype_counts.values,
-                names=dtype_counts.index,
-                title="数据类型分布"
-            )
+            # 数据类型饼图：由可视化工具模块构建
+            fig = create_data_type_chart(dtype_counts=dtype_counts)
             st.plotly_chart(fig, use_container_width=True)
         
         # 数据预览表格
@@ -353,29 +473,34 @@ class UXEnhancements:
         preview_data = data.head(max_rows)
         st.dataframe(preview_data, use_container_width=True)
         
-        # 列信息
+        # 列信息：各项统计对整个数据框一次性计算，不再逐列扫描
         st.write("**列信息**")
-        column_info = []
-        for col in data.columns:
-            col_info = {
-                "列名": col,
-                "数据类型": str(data[col].dtype),
-                "非空值": data[col].count(),
-                "缺失值": data[col].isnull().sum(),
-                "缺失比例": f"{data[col].isnull().sum() / len(data) * 100:.1f}%"
-            }
-            column_info.append(col_info)
-        
-        st.dataframe(pd.DataFrame(column_info), use_container_width=True)
+        if missing_counts is None:
+            missing_counts = data.isnull().sum()
+        missing = missing_counts.to_numpy()
+        column_info = pd.DataFrame({
+            "列名": data.columns,
+            "数据类型": data.dtypes.astype(str).to_numpy(),
+            "非空值": data.count().to_numpy(),
+            "缺失值": missing,
+            "缺失比例": [f"{ratio:.1f}%" for ratio in missing / len(data) * 100]
+        })
+        
+        st.dataframe(column_info, use_container_width=True)
     
-    def render_analysis_suggestions(self, data: pd.DataFrame):
-        """渲染分析建议"""
+    def render_analysis_suggestions(self, data: pd.DataFrame, missing_counts: Optional[pd.Series] = None):
+        """渲染分析建议，missing_counts为调用方已算好的各列缺失值数量，未提供时在此计算"""
         st.subheader("💡 智能分析建议")
         
         # 基于数据特征生成建议
-        numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = data.select_dtypes(include=['object', 'category']).columns.tolist()
-        missing_ratio = data.isnull().sum().sum() / (len(data) * len(data.columns))
+        # 按dtype.kind一次遍历列类型：数值为整数/无符号/浮点/复数，分类为object、字符串与category（kind均为O）
+        kinds = np.array([dtype.kind for dtype in data.dtypes], dtype='U1')
+        numeric_count = int(np.isin(kinds, _NUMERIC_KINDS).sum())
+        categorical_count = int((kinds == 'O').sum())
+        if missing_counts is None:
+            missing_counts = data.isnull().sum()
+        missing_ratio = missing_counts.sum() / (len(data) * len(data.columns))
+        duplicate_count = _count_duplicates(data)
         
         suggestions = []
         
@@ -387,22 +512,22 @@ class UXEnhancements:
                 "描述": f"数据中有{missing_ratio:.1%}的缺失值，建议进行数据清洗"
             })
         
-        if data.duplicated().sum() > 0:
+        if duplicate_count > 0:
             suggestions.append({
                 "优先级": "🔥 高",
                 "建议": "删除重复行",
-                "描述": f"发现{data.duplicated().sum()}行重复数据"
+                "描述": f"发现{duplicate_count}行重复数据"
             })
         
         # 分析建议
-        if len(numeric_cols) >= 2:
+        if numeric_count >= 2:
             suggestions.append({
                 "优先级": "📊 推荐",
                 "建议": "相关性分析",
                 "描述": "数值型变量较多，适合进行相关性分析"
             })
         
-        if len(categorical_cols) > 0:
+        if categorical_count > 0:
             suggestions.append({
                 "优先级": "📊 推荐",
                 "建议": "分类变量分析",
@@ -418,23 +543,18 @@ class UXEnhancements:
         
         # 显示建议
         if suggestions:
+            # 全部建议卡片拼接后一次输出
+            cards = []
             for suggestion in suggestions:
-                st.markdown(f"""
-                <div style="
-                    background: {'#ffebee' if '高' in suggestion['优先级'] else '#e8f5e8' if '推荐' in suggestion['优先级'] else '#fff3e0'};
-                    border-left: 4px solid {'#f44336' if '高' in suggestion['优先级'] else '#4caf50' if '推荐' in suggestion['优先级'] else '#ff9800'};
-                    padding: 15px;
-                    margin: 10px 0;
-                    border-radius: 5px;
-                ">
-                    <div style="font-weight: bold; margin-bottom: 5px;">
-                        {suggestion['优先级']} {suggestion['建议']}
-                    </div>
-                    <div style="color: #666;">
-                        {suggestion['描述']}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                background, border = _SUGGESTION_STYLES.get(suggestion['优先级'], _SUGGESTION_DEFAULT_STYLE)
+                cards.append(_SUGGESTION_TPL.format(
+                    background=background,
+                    border=border,
+                    priority=suggestion['优先级'],
+                    title=suggestion['建议'],
+                    description=suggestion['描述']
+                ))
+            st.markdown("".join(cards), unsafe_allow_html=True)
         else:
             st.info("✅ 数据质量良好，可以直接进行分析")
     
@@ -444,28 +564,35 @@ class UXEnhancements:
             st.sidebar.markdown("### 📈 工作流摘要")
             
             # 统计操作类型
-            operations = {}
-            for action in st.session_state.workflow_history:
-                op_type = action.split()[0] if action else "其他"
-                operations[op_type] = operations.get(op_type, 0) + 1
+            operations = Counter(
+                action.split(maxsplit=1)[0] if action else "其他"
+                for action in st.session_state.workflow_history
+            )
             
-            # 显示统计
-            for op_type, count in operations.items():
-                st.sidebar.text(f"{op_type}: {count}次")
+            # 显示统计，次数多的在前
+            st.sidebar.text("\n".join(f"{op_type}: {count}次" for op_type, count in operations.most_common()))
     
     def add_to_history(self, action: str):
         """添加到操作历史"""
         timestamp = time.strftime("%H:%M:%S")
         st.session_state.workflow_history.append(f"[{timestamp}] {action}")
-        
-        # 保持历史记录在合理范围内
-        if len(st.session_state.workflow_history) > 50:
-            st.session_state.workflow_history = st.session_state.workflow_history[-50:]
 
 
-# 全局用户体验增强实例
-ux_enhancements = UXEnhancements()
+# 全局实例：首次使用时才创建，导入模块不再产生Streamlit输出
+@st.cache_resource(show_spinner=False)
+def _create_ux_enhancements() -> UXEnhancements:
+    """创建进程内共享的用户体验增强实例"""
+    return UXEnhancements()
 
-def get_ux_enhancements():
+def get_ux_enhancements() -> UXEnhancements:
     """获取用户体验增强实例"""
-    return ux_enhancements
+    ux = _create_ux_enhancements()
+    # 实例在会话之间共享，会话状态的默认值需按当前会话补齐
+    ux.setup_session_state()
+    return ux
+
+def __getattr__(name: str):
+    """兼容原有的模块级实例名ux_enhancements，访问时才创建实例"""
+    if name == "ux_enhancements":
+        return get_ux_enhancements()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,12 +5,83 @@
 
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 from typing import List, Optional, Dict, Any, Tuple
 import streamlit as st
 
+# 图表构建结果缓存：输入数据与参数不变时，重跑直接返回缓存图表的副本，不再重新构建
+# 返回的是反序列化得到的新对象，调用方后续修改图表（如apply_custom_theme）不会影响缓存
+# 命中缓存也要对参数求哈希并反序列化整个图表，且st.cache_data对5万行以上的DataFrame只抽样1万行求哈希，
+# 抽样外的数据被修改时会返回旧图表。因此只用于输入为相关矩阵、模型评估结果等小型汇总数据的图表；
+# 直接接收原始数据的图表（直方图、箱线图等会把全部数据写入图表）每次重新构建
+_cache_figure = st.cache_data(max_entries=32, show_spinner=False)
+
+# 图表导出支持的图片格式
+IMAGE_FORMATS = frozenset({"png", "jpg", "jpeg", "webp", "svg", "pdf"})
+
+# 散点图、折线图、3D散点图默认最多绘制的点数，超出时先降采样再交给Plotly
+MAX_PLOT_POINTS = 20000
+
+
+def _sample_points(data: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """随机抽取max_points行（保持原有行顺序），用于散点图；点密度分布与原数据一致"""
+    if max_points <= 0 or len(data) <= max_points:
+        return data
+    positions = np.random.default_rng(0).choice(len(data), max_points, replace=False)
+    positions.sort()
+    return data.iloc[positions]
+
+
+def _minmax_positions(values: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    将序列按顺序等分成n_out//2个桶，每桶保留最小值与最大值所在位置，另保留首尾两点
+    折线的峰谷形状得以保留；各桶的计算为整块向量运算
+    """
+    n = len(values)
+    if n <= n_out:
+        return np.arange(n)
+    
+    bucket = -(-n // max(n_out // 2, 1))
+    usable = n // bucket * bucket
+    blocks = values[:usable].reshape(-1, bucket)
+    starts = np.arange(0, usable, bucket)
+    # 缺失值不参与极值比较
+    low = np.argmin(np.where(np.isnan(blocks), np.inf, blocks), axis=1) + starts
+    high = np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=1) + starts
+    tail = np.arange(usable, n)[:1]
+    return np.unique(np.concatenate(([0, n - 1], low, high, tail)))
+
+
+def _thin_line(data: pd.DataFrame, y_col: str, color_col: Optional[str], max_points: int) -> pd.DataFrame:
+    """
+    折线图降采样：数值列按桶保留极值点，非数值列按等间隔抽取
+    指定颜色分组时各组按行数比例分配点数，分别降采样
+    """
+    if max_points <= 0 or len(data) <= max_points:
+        return data
+    
+    y = data[y_col]
+    numeric = pd.api.types.is_numeric_dtype(y) and not pd.api.types.is_bool_dtype(y)
+    values = y.to_numpy(dtype='f8', na_value=np.nan) if numeric else None
+    
+    def pick(positions: np.ndarray) -> np.ndarray:
+        n_out = max(2, max_points * len(positions) // len(data))
+        if len(positions) <= n_out:
+            return positions
+        if numeric:
+            return positions[_minmax_positions(values[positions], n_out)]
+        return positions[np.linspace(0, len(positions) - 1, n_out).astype(np.intp)]
+    
+    if color_col:
+        groups = data.groupby(color_col, sort=False, dropna=False).indices.values()
+        selected = np.sort(np.concatenate([pick(np.asarray(positions)) for positions in groups]))
+    else:
+        selected = pick(np.arange(len(data)))
+    return data.iloc[selected]
+
 
 def create_bar_chart(data: pd.DataFrame, x_col: str, y_col: str, 
                     color_col: Optional[str] = None, title: str = "") -> go.Figure:
@@ -41,7 +112,8 @@ def create_bar_chart(data: pd.DataFrame, x_col: str, y_col: str,
 
 
 def create_line_chart(data: pd.DataFrame, x_col: str, y_col: str,
-                     color_col: Optional[str] = None, title: str = "") -> go.Figure:
+                     color_col: Optional[str] = None, title: str = "",
+                     max_points: int = MAX_PLOT_POINTS) -> go.Figure:
     """
     创建折线图
     
@@ -51,10 +123,12 @@ def create_line_chart(data: pd.DataFrame, x_col: str, y_col: str,
         y_col: Y轴列名
         color_col: 颜色分组列名
         title: 图表标题
+        max_points: 最多绘制的点数，超出时按桶保留极值点降采样，0表示不降采样
         
     Returns:
         go.Figure: Plotly图表对象
     """
+    data = _thin_line(data, y_col, color_col, max_points)
     if color_col:
         fig = px.line(data, x=x_col, y=y_col, color=color_col, title=title)
     else:
@@ -70,7 +144,7 @@ def create_line_chart(data: pd.DataFrame, x_col: str, y_col: str,
 
 def create_scatter_chart(data: pd.DataFrame, x_col: str, y_col: str,
                         color_col: Optional[str] = None, size_col: Optional[str] = None,
-                        title: str = "") -> go.Figure:
+                        title: str = "", max_points: int = MAX_PLOT_POINTS) -> go.Figure:
     """
     创建散点图
     
@@ -81,10 +155,12 @@ def create_scatter_chart(data: pd.DataFrame, x_col: str, y_col: str,
         color_col: 颜色分组列名
         size_col: 大小列名
         title: 图表标题
+        max_points: 最多绘制的点数，超出时随机抽样，0表示不降采样
         
     Returns:
         go.Figure: Plotly图表对象
     """
+    data = _sample_points(data, max_points)
     if color_col and size_col:
         fig = px.scatter(data, x=x_col, y=y_col, color=color_col, size=size_col, title=title)
     elif color_col:
@@ -168,6 +244,7 @@ def create_box_chart(data: pd.DataFrame, y_col: str, x_col: Optional[str] = None
     return fig
 
 
+@_cache_figure
 def create_heatmap(corr_matrix: pd.DataFrame, title: str = "相关性热力图") -> go.Figure:
     """
     创建热力图
@@ -219,7 +296,8 @@ def create_violin_chart(data: pd.DataFrame, y_col: str, x_col: Optional[str] = N
 
 
 def create_3d_scatter(data: pd.DataFrame, x_col: str, y_col: str, z_col: str,
-                     color_col: Optional[str] = None, title: str = "") -> go.Figure:
+                     color_col: Optional[str] = None, title: str = "",
+                     max_points: int = MAX_PLOT_POINTS) -> go.Figure:
     """
     创建3D散点图
     
@@ -230,10 +308,12 @@ def create_3d_scatter(data: pd.DataFrame, x_col: str, y_col: str, z_col: str,
         z_col: Z轴列名
         color_col: 颜色分组列名
         title: 图表标题
+        max_points: 最多绘制的点数，超出时随机抽样，0表示不降采样
         
     Returns:
         go.Figure: Plotly图表对象
     """
+    data = _sample_points(data, max_points)
     if color_col:
         fig = px.scatter_3d(data, x=x_col, y=y_col, z=z_col, color=color_col, title=title)
     else:
@@ -261,12 +341,17 @@ def create_radar_chart(data: pd.DataFrame, columns: List[str], title: str = "")
     Returns:
         go.Figure: Plotly图表对象
     """
-    # 计算平均值用于雷达图
-    avg_values = data[columns].mean()
+    # 计算平均值用于雷达图：一次转换为float64数组，忽略缺失值按列求均值
+    values = data[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_values = np.where(valid, values, 0.0).sum(axis=0) / valid.sum(axis=0)
+    # fmax忽略NaN，与Series.max()一致
+    max_value = np.fmax.reduce(avg_values) if len(avg_values) else np.nan
     
     fig = go.Figure()
     fig.add_trace(go.Scatterpolar(
-        r=avg_values.values,
+        r=avg_values,
         theta=columns,
         fill='toself',
         name='平均值'
@@ -276,7 +361,7 @@ def create_radar_chart(data: pd.DataFrame, columns: List[str], title: str = "")
         polar=dict(
             radialaxis=dict(
                 visible=True,
-                range=[0, avg_values.max() * 1.2]
+                range=[0, max_value * 1.2]
             )),
         showlegend=True,
         title=title
@@ -294,18 +379,22 @@ def create_missing_values_chart(data: pd.DataFrame) -> go.Figure:
     Returns:
         go.Figure: Plotly图表对象
     """
+    # 百分比由同一组计数换算；空数据框没有行，百分比记为0
     missing_data = data.isnull().sum()
-    missing_percent = (missing_data / len(data)) * 100
+    if len(data) > 0:
+        missing_percent = missing_data.to_numpy() * (100.0 / len(data))
+    else:
+        missing_percent = np.zeros(len(missing_data))
     
     fig = go.Figure()
     fig.add_trace(go.Bar(
-        x=data.columns,
-        y=missing_data,
+        x=missing_data.index,
+        y=missing_data.to_numpy(),
         name='缺失值数量',
         marker_color='#ff7f0e'
     ))
     fig.add_trace(go.Scatter(
-        x=data.columns,
+        x=missing_data.index,
         y=missing_percent,
         name='缺失值百分比',
         yaxis='y2'
@@ -321,17 +410,20 @@ def create_missing_values_chart(data: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def create_data_type_chart(data: pd.DataFrame) -> go.Figure:
+def create_data_type_chart(data: Optional[pd.DataFrame] = None,
+                           dtype_counts: Optional[pd.Series] = None) -> go.Figure:
     """
     创建数据类型分布图表
     
     Args:
         data: 数据框
+        dtype_counts: 已计算好的data.dtypes.value_counts()，提供时无需传入data
         
     Returns:
         go.Figure: Plotly图表对象
     """
-    dtype_counts = data.dtypes.value_counts()
+    if dtype_counts is None:
+        dtype_counts = data.dtypes.value_counts()
     dtype_labels = [str(dtype) for dtype in dtype_counts.index]
     
     fig = go.Figure(data=[go.Pie(
@@ -346,6 +438,7 @@ def create_data_type_chart(data: pd.DataFrame) -> go.Figure:
     return fig
 
 
+@_cache_figure
 def create_correlation_heatmap(correlation_matrix: pd.DataFrame) -> go.Figure:
     """
     创建相关性热力图
@@ -438,6 +531,7 @@ def create_distribution_comparison(data: pd.DataFrame, column: str, title: str =
     return fig
 
 
+@_cache_figure
 def create_learning_curve(train_sizes: np.ndarray, train_scores: np.ndarray, 
                          val_scores: np.ndarray, title: str = "学习曲线") -> go.Figure:
     """
@@ -480,6 +574,7 @@ def create_learning_curve(train_sizes: np.ndarray, train_scores: np.ndarray,
     return fig
 
 
+@_cache_figure
 def create_confusion_matrix(cm: np.ndarray, labels: List[str], title: str = "混淆矩阵") -> go.Figure:
     """
     创建混淆矩阵热力图
@@ -503,6 +598,7 @@ def create_confusion_matrix(cm: np.ndarray, labels: List[str], title: str = "混
     return fig
 
 
+@_cache_figure
 def create_feature_importance(feature_names: List[str], importance_scores: np.ndarray, 
                             title: str = "特征重要性") -> go.Figure:
     """
@@ -568,8 +664,34 @@ def save_chart_as_image(fig: go.Figure, filename: str, format: str = "png",
     Args:
         fig: Plotly图表对象
         filename: 文件名
-        format: 图片格式 (png, jpg, svg, pdf)
+        format: 图片格式 (png, jpg, jpeg, webp, svg, pdf)
         width: 图片宽度
         height: 图片高度
     """
-    fig.write_image(f"{filename}.{format}", width=width, height=height)
+    save_charts_as_images([fig], [filename], format=format, width=width, height=height)
+
+
+def save_charts_as_images(figs: List[go.Figure], filenames: List[str], format: str = "png",
+                          width: int = 800, height: int = 600) -> None:
+    """
+    批量保存图表为图片文件，所有图表共用一个Kaleido渲染会话，避免每张图都重新启动浏览器
+    
+    Args:
+        figs: Plotly图表对象列表
+        filenames: 与图表一一对应的文件名（不含扩展名）
+        format: 图片格式 (png, jpg, jpeg, webp, svg, pdf)
+        width: 图片宽度
+        height: 图片高度
+    """
+    if format not in IMAGE_FORMATS:
+        raise ValueError(f"不支持的图片格式: {format}")
+    if len(figs) != len(filenames):
+        raise ValueError("图表数量与文件名数量不一致")
+    
+    paths = [f"{filename}.{format}" for filename in filenames]
+    if hasattr(pio, "write_images"):
+        # plotly>=6.1：批量接口在同一个渲染会话中依次导出
+        pio.write_images(figs, paths, format=format, width=width, height=height)
+    else:
+        for fig, path in zip(figs, paths):
+            fig.write_image(path, format=format, width=width, height=height)